@@ -8,6 +8,7 @@ ASR Client Abstract Base Class
 确保不同引擎可以无缝切换。
 """
 
+import threading
 from abc import ABC, abstractmethod
 from typing import Optional, AsyncGenerator
 from .result import StreamingResult, StreamingState
@@ -28,6 +29,16 @@ class ASRClient(ABC):
         """引擎是否可用"""
         pass
 
+    @property
+    def lock(self) -> threading.Lock:
+        """客户端级互斥锁
+
+        ASRClientFactory 会在多个调用方之间共享同一客户端，而本地模型推理
+        不是线程安全的；共享客户端的调用方应在推理期间持有此锁。
+        """
+        # dict.setdefault 是原子操作，并发首次访问也只会创建一把锁
+        return self.__dict__.setdefault('_client_lock', threading.Lock())
+
     @abstractmethod
     def transcribe(self, audio_path: str) -> str:
         """
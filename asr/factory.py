@@ -8,6 +8,8 @@ ASR 客户端工厂类。
 支持引擎热切换、自动回退和智能选择。
 """
 
+import threading
+from collections import OrderedDict
 from typing import Optional, Tuple
 from .base import ASRClient
 from .moss_client import MossClient
@@ -26,6 +28,11 @@ class ASRClientFactory:
         'nano-2512': FunASRNanoClient,
         'nano-mlt': FunASRNanoClient,
     }
+
+    # create_with_fallback 创建的客户端缓存（LRU），同配置重复创建时复用已加载的模型
+    CLIENT_CACHE_SIZE = 4
+    _client_cache: "OrderedDict[tuple, ASRClient]" = OrderedDict()
+    _client_cache_lock = threading.Lock()
     
     @classmethod
     def create(cls, engine: str, **kwargs) -> ASRClient:
@@ -63,18 +70,62 @@ class ASRClientFactory:
         return list(cls._engines.keys())
     
     @classmethod
-    def create_with_fallback(cls, primary_engine: str, fallback_engine: str = 'moss', **kwargs) -> ASRClient:
+    def create_with_fallback(
+        cls,
+        primary_engine: str,
+        fallback_engine: str = 'moss',
+        use_cache: bool = True,
+        **kwargs
+    ) -> ASRClient:
         """
         创建 ASR 客户端，失败自动回退
 
+        缓存的客户端会被多个调用方共享，推理期间应持有 `client.lock`。
+        回退得到的客户端不缓存，首选引擎恢复后下次调用会重新尝试。
+
         Args:
             primary_engine: 首选引擎
             fallback_engine: 回退引擎 (默认: 'moss')
+            use_cache: 是否复用相同配置已创建的客户端（默认 True）
             **kwargs: 引擎特定配置
 
         Returns:
             ASRClient 实例（首选或回退引擎）
         """
+        key = None
+        if use_cache:
+            key = (primary_engine, fallback_engine, frozenset(kwargs.items()))
+            try:
+                hash(key)
+            except TypeError:
+                # 配置中含不可哈希的值，不缓存
+                key = None
+        if key is None:
+            return cls._create_with_fallback(primary_engine, fallback_engine, **kwargs)
+
+        with cls._client_cache_lock:
+            client = cls._client_cache.get(key)
+            if client is not None:
+                cls._client_cache.move_to_end(key)
+                return client
+            client = cls._create_with_fallback(primary_engine, fallback_engine, **kwargs)
+            # 只缓存首选引擎；首选引擎偶发加载失败时不能让回退客户端长期占据该配置
+            primary_class = cls._engines.get(primary_engine)
+            if primary_class is not None and isinstance(client, primary_class):
+                cls._client_cache[key] = client
+                if len(cls._client_cache) > cls.CLIENT_CACHE_SIZE:
+                    cls._client_cache.popitem(last=False)
+        return client
+
+    @classmethod
+    def clear_cache(cls):
+        """清空客户端缓存（已持有客户端的调用方不受影响）"""
+        with cls._client_cache_lock:
+            cls._client_cache.clear()
+
+    @classmethod
+    def _create_with_fallback(cls, primary_engine: str, fallback_engine: str, **kwargs) -> ASRClient:
+        """create_with_fallback 的实际创建逻辑（不经过缓存）"""
         # 获取回退引擎需要的参数
         fallback_kwargs = kwargs.copy()
         if fallback_engine == 'moss':
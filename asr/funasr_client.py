@@ -10,11 +10,24 @@ FunASR 本地语音识别引擎实现。
 """
 
 import re
+from enum import IntEnum
 from typing import Optional, List
 
 from .base import ASRClient
 from .result import ASRResult, SpeakerSegment
 
+# SenseVoice 特殊标签，如 <|zh|><|NEUTRAL|>
+_SENSEVOICE_TAG_RE = re.compile(r'<\|[^|]+\|>')
+
+
+class ModelKind(IntEnum):
+    """FunASR 模型类别（初始化时解析一次，热路径用 `is` 比较）"""
+    OTHER = 0
+    PARAFORMER_ZH = 1
+    SENSEVOICE = 2
+    PARAFORMER_EN = 3
+    TELEPHONE = 4
+
 
 class FunASRClient(ASRClient):
     """FunASR 本地 ASR 引擎"""
@@ -35,6 +48,21 @@ class FunASRClient(ASRClient):
         'telephone': 'paraformer-zh',
     }
 
+    # 模型名称到模型类别的映射（未列出的模型名视为 OTHER）
+    MODEL_KIND_MAP = {
+        'paraformer-zh': ModelKind.PARAFORMER_ZH,
+        'sensevoice': ModelKind.SENSEVOICE,
+        'paraformer-en': ModelKind.PARAFORMER_EN,
+        'telephone': ModelKind.TELEPHONE,
+    }
+
+    # 支持说话人分离的模型类别
+    DIARIZATION_KINDS = frozenset({
+        ModelKind.PARAFORMER_ZH,
+        ModelKind.PARAFORMER_EN,
+        ModelKind.TELEPHONE,
+    })
+
     def __init__(self, model: str = 'paraformer-zh', device: str = 'cpu', enable_diarization: bool = False):
         """
         初始化 FunASR 客户端
@@ -45,6 +73,8 @@ class FunASRClient(ASRClient):
             enable_diarization: 是否启用说话人分离（默认 False）
         """
         self._model_name = model
+        self._model_kind = self.MODEL_KIND_MAP.get(model, ModelKind.OTHER)
+        self._display_name = f"FunASR ({model})"
         self._device = device
         self._enable_diarization = enable_diarization
         self._model_instance = None
@@ -64,14 +94,14 @@ class FunASRClient(ASRClient):
             }
 
             # SenseVoice 需要启用 VAD 和 PUNC
-            if self._model_name == 'sensevoice':
+            if self._model_kind is ModelKind.SENSEVOICE:
                 model_kwargs['vad_model'] = "fsmn-vad"
                 model_kwargs['punc_model'] = "ct-punc-c"
 
             # 启用说话人分离
             if self._enable_diarization:
                 # 检查模型是否支持说话人分离
-                supports_diar = self._model_name in ['paraformer-zh', 'paraformer-en', 'telephone']
+                supports_diar = self._model_kind in self.DIARIZATION_KINDS
                 if not supports_diar:
                     print(f"⚠️  模型 {self._model_name} 不支持说话人分离，已禁用")
                     self._enable_diarization = False
@@ -106,16 +136,17 @@ class FunASRClient(ASRClient):
         Returns:
             清理后的纯文本
         """
-        # 移除所有 <|xxx|> 格式的标签
-        text = re.sub(r'<\|[^|]+\|>', '', text)
-        # 移除多余空白（换行、制表符等）
-        text = re.sub(r'\s+', ' ', text)
-        # 去除首尾空白
-        return text.strip()
+        if not text:
+            return ""
+        # 移除所有 <|xxx|> 格式的标签（无标签时跳过正则）
+        if "<|" in text:
+            text = _SENSEVOICE_TAG_RE.sub('', text)
+        # 合并多余空白（换行、制表符等）并去除首尾空白
+        return " ".join(text.split())
 
     @property
     def name(self) -> str:
-        return f"FunASR ({self._model_name})"
+        return self._display_name
 
     @property
     def is_available(self) -> bool:
@@ -134,9 +165,35 @@ class FunASRClient(ASRClient):
         if not self._model_instance:
             raise RuntimeError("FunASR 模型未加载")
 
-        result = self._model_instance.generate(audio_path)
+        return self._extract_text(self._model_instance.generate(audio_path))
+
+    def transcribe_array(self, audio_array, sample_rate: int = 16000) -> str:
+        """
+        直接转写内存中的音频数组（不落盘，不做 WAV 编解码）
+
+        Args:
+            audio_array: numpy 音频数组（int16 PCM 或 [-1, 1] 浮点，单声道）
+            sample_rate: 采样率，非 16kHz 时由 FunASR 重采样
+
+        Returns:
+            识别后的文本
+        """
+        if not self._model_instance:
+            raise RuntimeError("FunASR 模型未加载")
+
+        import numpy as np
 
-        # 处理结果
+        audio = np.asarray(audio_array).reshape(-1)
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768.0
+        else:
+            audio = audio.astype(np.float32, copy=False)
+
+        result = self._model_instance.generate(input=audio, fs=sample_rate)
+        return self._extract_text(result)
+
+    def _extract_text(self, result) -> str:
+        """从 FunASR generate 结果中提取文本"""
         if not result:
             return ""
 
@@ -157,40 +214,22 @@ class FunASRClient(ASRClient):
             text = str(result)
 
         # SenseVoice 输出需要清理特殊标记
-        if self._model_name == 'sensevoice':
+        if self._model_kind is ModelKind.SENSEVOICE:
             text = self._clean_sensevoice_output(text)
 
         return text
     
     def transcribe_audio_data(self, audio_data) -> str:
         """
-        转写音频数据（保存为临时文件）
-        
+        转写音频数据（16kHz，内存直传，不写临时文件）
+
         Args:
             audio_data: numpy 音频数组
-            
+
         Returns:
             识别后的文本
         """
-        import tempfile
-        import wave
-        import os
-        
-        # 保存为临时 WAV 文件
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            temp_path = f.name
-        
-        # 写入 WAV
-        with wave.open(temp_path, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(16000)
-            wf.writeframes(audio_data.astype('int16').tobytes())
-        
-        try:
-            return self.transcribe(temp_path)
-        finally:
-            os.unlink(temp_path)
+        return self.transcribe_array(audio_data, 16000)
 
     def recognize(
         self,
@@ -240,7 +279,7 @@ class FunASRClient(ASRClient):
         text = raw.get("text", "")
 
         # SenseVoice 输出需要清理特殊标记
-        if self._model_name == 'sensevoice':
+        if self._model_kind is ModelKind.SENSEVOICE:
             text = self._clean_sensevoice_output(text)
 
         # 说话人分离结果
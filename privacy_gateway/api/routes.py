@@ -66,8 +66,8 @@ async def protect_text(request: ProtectRequest) -> ProtectResponse:
     detector = get_detector()
     tokenizer = get_tokenizer()
 
-    # 检测 PII
-    pii_results = detector.detect(request.text)
+    # 检测 PII（相同值合并，只 token 化一次）
+    pii_results = detector.detect_unique(request.text)
 
     if not pii_results:
         return ProtectResponse(
@@ -82,6 +82,7 @@ async def protect_text(request: ProtectRequest) -> ProtectResponse:
 
     for pii in pii_results:
         token = tokenizer.tokenize(pii.value, pii.pii_type)
+        # str.replace 会替换该值的所有出现位置
         protected_text = protected_text.replace(pii.value, token)
 
         # 收集 token 映射（token -> 原始值，用于还原）
@@ -94,7 +95,7 @@ async def protect_text(request: ProtectRequest) -> ProtectResponse:
         protected_text=protected_text,
         tokens=tokens,
         metadata={
-            "pii_count": len(pii_results),
+            "pii_count": sum(len(r.spans) for r in pii_results),
             "types_detected": list(set(r.pii_type.value for r in pii_results))
         }
     )
@@ -6,20 +6,31 @@ PII 检测器：使用正则表达式检测文本中的隐私信息
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-from .patterns import PIIType, PII_PATTERNS
+from .patterns import PIIType, PII_PATTERNS, fold_width
 
 
-@dataclass
-class PIIDetectionResult:
-    """PII 检测结果"""
+class PIIDetectionResult(NamedTuple):
+    """PII 检测结果（不可变；NamedTuple 无实例 __dict__，构造走 tuple.__new__）"""
     value: str
     pii_type: PIIType
     start: int
     end: int
 
 
+@dataclass
+class PIIUniqueResult:
+    """去重后的 PII 检测结果（同一值只保留一条，记录所有出现位置）"""
+    value: str
+    pii_type: PIIType
+    spans: List[Tuple[int, int]]
+
+
+_by_start = attrgetter("start")
+
+
 class PIIDetector:
     """PII 检测器"""
 
@@ -28,25 +39,49 @@ class PIIDetector:
         pass
 
     def detect(self, text: str) -> List[PIIDetectionResult]:
-        """检测文本中的所有 PII"""
+        """检测文本中的所有 PII
+
+        在全角折叠后的文本上匹配（长度不变），返回的 value 取自原文。
+        """
         results: List[PIIDetectionResult] = []
+        append = results.append
+        scan = fold_width(text)
 
         for pii_pattern in PII_PATTERNS:
-            pattern = pii_pattern.pattern
-            for match in pattern.finditer(text):
-                results.append(PIIDetectionResult(
-                    value=match.group(),
-                    pii_type=pii_pattern.pii_type,
-                    start=match.start(),
-                    end=match.end()
+            pii_type = pii_pattern.pii_type
+            for match in pii_pattern.pattern.finditer(scan):
+                start, end = match.span()
+                append(PIIDetectionResult(
+                    value=text[start:end],
+                    pii_type=pii_type,
+                    start=start,
+                    end=end
                 ))
 
-        results.sort(key=lambda x: x.start)
+        results.sort(key=_by_start)
         return results
 
+    def detect_unique(self, text: str) -> List[PIIUniqueResult]:
+        """检测文本中的 PII，相同值合并为一条结果（按首次出现位置排序）"""
+        unique: Dict[str, PIIUniqueResult] = {}
+
+        for result in self.detect(text):
+            entry = unique.get(result.value)
+            if entry is None:
+                unique[result.value] = PIIUniqueResult(
+                    value=result.value,
+                    pii_type=result.pii_type,
+                    spans=[(result.start, result.end)]
+                )
+            else:
+                entry.spans.append((result.start, result.end))
+
+        return list(unique.values())
+
     def detect_types(self, text: str) -> List[PIIType]:
         """检测文本中包含的 PII 类型"""
         types = set()
+        text = fold_width(text)
         for pii_pattern in PII_PATTERNS:
             if pii_pattern.pattern.search(text):
                 types.add(pii_pattern.pii_type)
@@ -54,6 +89,7 @@ class PIIDetector:
 
     def has_pii(self, text: str) -> bool:
         """检查文本是否包含 PII"""
+        text = fold_width(text)
         for pii_pattern in PII_PATTERNS:
             if pii_pattern.pattern.search(text):
                 return True
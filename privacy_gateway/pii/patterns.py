@@ -12,7 +12,7 @@ PII Regex Patterns
 import re
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional, Pattern
+from typing import Callable, Optional, Pattern
 
 
 class PIIType(str, Enum):
@@ -31,37 +31,72 @@ class PIIPattern:
     pattern: Pattern[str]
     min_length: int
     max_length: int
+    # 快速预检：廉价的字符判断，返回 False 时跳过正则
+    prefilter: Optional[Callable[[str], bool]] = None
 
 
-# 正则模式定义
+def _phone_prefilter(s: str) -> bool:
+    return s[0] == '1' and '3' <= s[1] <= '9' and s.isdigit()
+
+
+def _id_card_prefilter(s: str) -> bool:
+    return s[:-1].isdigit()
+
+
+def _credit_card_prefilter(s: str) -> bool:
+    return s[0] == '6' and s.isdigit()
+
+
+def _email_prefilter(s: str) -> bool:
+    return '.' in s.rpartition('@')[2]
+
+
+# 全角 ASCII 字符（U+FF01-U+FF5E）-> 半角。中文输入常见全角数字，逐字符一一对应、
+# 不改变长度，折叠后文本上的匹配位置可直接用于原文
+_FULLWIDTH_FOLD = {cp: cp - 0xFEE0 for cp in range(0xFF01, 0xFF5F)}
+
+
+def fold_width(text: str) -> str:
+    """将全角数字、字母和符号折叠为半角（纯 ASCII 文本原样返回）"""
+    if text.isascii():
+        return text
+    return text.translate(_FULLWIDTH_FOLD)
+
+
+# 正则模式定义（数字类 PII 在 fold_width 折叠后只含 ASCII 字符，使用 re.ASCII
+# 走更窄的字符类匹配；调用方须先对文本执行 fold_width）
 PII_PATTERNS: list[PIIPattern] = [
     # 手机号: 1开头，3-9开头，共11位
     PIIPattern(
         pii_type=PIIType.PHONE,
-        pattern=re.compile(r"1[3-9]\d{9}"),
+        pattern=re.compile(r"1[3-9]\d{9}", re.ASCII),
         min_length=11,
-        max_length=11
+        max_length=11,
+        prefilter=_phone_prefilter
     ),
     # 身份证号: 18位，最后一位可能是X
     PIIPattern(
         pii_type=PIIType.ID_CARD,
-        pattern=re.compile(r"\d{17}[\dXx]"),
+        pattern=re.compile(r"\d{17}[\dXx]", re.ASCII),
         min_length=18,
-        max_length=18
+        max_length=18,
+        prefilter=_id_card_prefilter
     ),
     # 银行卡号: 62开头，16-19位
     PIIPattern(
         pii_type=PIIType.CREDIT_CARD,
-        pattern=re.compile(r"6[2-9]\d{14,17}"),
+        pattern=re.compile(r"6[2-9]\d{14,17}", re.ASCII),
         min_length=16,
-        max_length=19
+        max_length=19,
+        prefilter=_credit_card_prefilter
     ),
-    # 邮箱地址
+    # 邮箱地址（不加 re.ASCII：国际化域名/用户名需要 Unicode \w）
     PIIPattern(
         pii_type=PIIType.EMAIL,
         pattern=re.compile(r"[\w.-]+@[\w.-]+\.\w+"),
         min_length=5,
-        max_length=254
+        max_length=254,
+        prefilter=_email_prefilter
     ),
 ]
 
@@ -75,8 +110,18 @@ def get_pattern_by_type(pii_type: PIIType) -> Optional[Pattern[str]]:
 
 
 def detect_pii_type(text: str) -> Optional[PIIType]:
-    """检测文本对应的 PII 类型"""
+    """检测文本对应的 PII 类型
+
+    先用长度和预检函数快速排除，只有通过预检的候选才交给正则确认。
+    全角数字等字符先折叠为半角再判断。
+    """
+    text = fold_width(text)
+    length = len(text)
     for p in PII_PATTERNS:
-        if p.pattern.match(text):
+        if not p.min_length <= length <= p.max_length:
+            continue
+        if p.prefilter is not None and not p.prefilter(text):
+            continue
+        if p.pattern.fullmatch(text):
             return p.pii_type
     return PIIType.UNKNOWN
@@ -5,8 +5,10 @@ PII Tokenizer Module
 Token 生成器：将 PII 替换为可逆的 token
 """
 
+import re
 import uuid
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import json
 from pathlib import Path
@@ -39,6 +41,7 @@ class PIITokenizer:
         self._reverse_map: Dict[str, str] = {}  # Token -> PII
         self._token_info: Dict[str, TokenInfo] = {}  # Token -> Info
         self._counter: Dict[str, int] = {}  # 类型计数器
+        self._token_pattern = _compile_token_pattern(settings.token_prefix)
 
         # 加载已有存储
         self._load()
@@ -61,8 +64,9 @@ class PIITokenizer:
             Token 字符串
         """
         # 检查是否已有映射
-        if pii_value in self._forward_map:
-            return self._forward_map[pii_value]
+        token = self._forward_map.get(pii_value)
+        if token is not None:
+            return token
 
         # 生成唯一 token
         if custom_id:
@@ -70,10 +74,9 @@ class PIITokenizer:
         else:
             # 类型计数器，确保同类型 token 序号递增
             type_key = pii_type.value
-            if type_key not in self._counter:
-                self._counter[type_key] = 0
-            self._counter[type_key] += 1
-            token_id = str(self._counter[type_key])
+            count = self._counter.get(type_key, 0) + 1
+            self._counter[type_key] = count
+            token_id = str(count)
 
         token = settings.token_prefix.format(
             type=pii_type.value,
@@ -85,7 +88,6 @@ class PIITokenizer:
         self._reverse_map[token] = pii_value
 
         # 记录 token 信息
-        from datetime import datetime, timezone
         self._token_info[token] = TokenInfo(
             token=token,
             pii_value=pii_value,
@@ -107,6 +109,22 @@ class PIITokenizer:
         """
         return self._reverse_map.get(token, token)
 
+    def restore_all(self, text: str) -> str:
+        """
+        一次扫描还原文本中的所有 token
+
+        Args:
+            text: 含 token 的文本
+
+        Returns:
+            还原后的文本（未知 token 原样保留）
+        """
+        reverse_map = self._reverse_map
+        return self._token_pattern.sub(
+            lambda m: reverse_map.get(m.group(), m.group()),
+            text
+        )
+
     def get_pii_type(self, token: str) -> Optional[PIIType]:
         """
         获取 token 对应的 PII 类型
@@ -176,6 +194,17 @@ class PIITokenizer:
         self._save()
 
 
+def _compile_token_pattern(token_prefix: str) -> "re.Pattern[str]":
+    """根据 token 格式（如 "[PII_{type}_{id}]"）生成匹配任意 token 的正则"""
+    placeholders = {"type": r"[A-Z_]+", "id": r"[^\s\]]+"}
+    parts = re.split(r"\{(type|id)\}", token_prefix)
+    # re.split 带捕获组：偶数下标为字面量，奇数下标为占位符名
+    return re.compile("".join(
+        placeholders[part] if i % 2 else re.escape(part)
+        for i, part in enumerate(parts)
+    ))
+
+
 # 全局 tokenizer 实例
 _tokenizer: Optional[PIITokenizer] = None
 
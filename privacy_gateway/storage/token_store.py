@@ -2,51 +2,278 @@
 PII Storage Module
 ==================
 
-Token 持久化存储：JSON 文件存储映射关系
+Token 持久化存储：JSON 快照 + 追加式操作日志
+
+- 快照文件 (`store_path`) 保存某一时刻的完整映射
+- 操作日志 (`store_path.log`) 每行一条 set/del 记录，写入只追加
+- 启动时加载快照并重放日志；`compact()` 将日志合并回快照
+- 也可传入二进制流（如 `io.BytesIO`）作为后端，整个流即操作日志
+- 日志由后台线程写入，`set`/`delete` 入队即返回；`flush()` 等待落盘，
+  并抛出后台写入期间发生的错误
 """
 
 import json
+import os
+import queue
+import threading
+import weakref
 from pathlib import Path
-from typing import Dict, Optional
+from typing import IO, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选加速依赖
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """序列化为 UTF-8 JSON 字节"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """反序列化 JSON 字节"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _LogWriter:
+    """操作日志写入端（由后台线程使用，`lock` 供压缩时互斥）"""
+
+    def __init__(self, log_path: Optional[Path], stream: Optional[IO[bytes]], fsync_every: int):
+        self.log_path = log_path
+        self.stream = stream
+        self.fsync_every = fsync_every
+        self.lock = threading.Lock()
+        self._file: Optional[IO[bytes]] = stream
+        self._pending = 0
+        # 后台线程写入失败时记录的第一个异常，由 TokenStore.flush() 取出并抛出
+        self.error: Optional[BaseException] = None
+
+    def write(self, line: bytes):
+        """追加一行（不立即 flush，由 `flush()` 批量提交）"""
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.log_path, 'ab')
+            elif self.stream is not None:
+                self.stream.seek(0, os.SEEK_END)
+            self._file.write(line)
+            self._pending += 1
+
+    def flush(self, force_sync: bool = False):
+        """刷到操作系统缓冲区；累计条数达到阈值（或强制）时 fsync"""
+        with self.lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            if self._pending and (force_sync or self._pending >= self.fsync_every):
+                if self.stream is None:
+                    os.fsync(self._file.fileno())
+                self._pending = 0
+
+    def reset(self):
+        """丢弃当前日志文件（调用方需持有 `lock`）"""
+        self._pending = 0
+        if self.stream is None:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.log_path.unlink(missing_ok=True)
+
+    def close(self):
+        """关闭日志文件（流后端由调用方负责关闭）"""
+        self.flush(force_sync=True)
+        with self.lock:
+            if self.stream is None and self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_STOP = object()
+
+
+def _drain(write_q: "queue.SimpleQueue", writer: _LogWriter):
+    """后台线程：顺序写入日志；队列空闲时才 flush，实现批量提交
+
+    写入失败不会终止线程：异常记录到 `writer.error`，flush 事件总会被置位
+    """
+    while True:
+        item = write_q.get()
+        try:
+            if item is _STOP:
+                writer.close()
+                return
+            if isinstance(item, threading.Event):
+                writer.flush(force_sync=True)
+                continue
+            writer.write(item)
+            if write_q.empty():
+                writer.flush()
+        except Exception as e:
+            if writer.error is None:
+                writer.error = e
+        finally:
+            if isinstance(item, threading.Event):
+                item.set()
+
+
+def _stop_worker(write_q: "queue.SimpleQueue", thread: threading.Thread):
+    """停止后台线程并等待剩余日志写完"""
+    write_q.put(_STOP)
+    thread.join()
 
 
 class TokenStore:
     """Token 持久化存储"""
 
-    def __init__(self, store_path: Path):
+    # 每累计多少条日志执行一次 fsync
+    DEFAULT_FSYNC_EVERY = 64
+
+    def __init__(
+        self,
+        backend: Union[str, os.PathLike, IO[bytes]],
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+    ):
         """
         初始化存储
 
         Args:
-            store_path: 存储文件路径
+            backend: 快照文件路径（日志文件为同名 `.log` 后缀），
+                或二进制流（如 `io.BytesIO`，整个流作为操作日志）
+            fsync_every: 每累计多少条日志执行一次 fsync
         """
-        self.store_path = store_path
+        self.fsync_every = max(1, fsync_every)
         self._data: Dict[str, dict] = {}
 
-        # 确保目录存在
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(backend, (str, os.PathLike)):
+            self.store_path: Optional[Path] = Path(backend)
+            self.log_path: Optional[Path] = self.store_path.with_name(self.store_path.name + ".log")
+            self._stream: Optional[IO[bytes]] = None
+
+            # 确保目录存在
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self.store_path = None
+            self.log_path = None
+            self._stream = backend
+
+        self._writer = _LogWriter(self.log_path, self._stream, self.fsync_every)
+        self._write_q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._finalizer: Optional[weakref.finalize] = None
 
         # 加载已有数据
         self._load()
 
     def _load(self):
-        """从文件加载数据"""
+        """加载快照并重放操作日志"""
+        self._data = {}
+        if self._stream is not None:
+            self._stream.seek(0)
+            for line in self._stream:
+                self._replay(line)
+            return
+
         if self.store_path.exists():
             try:
-                with open(self.store_path, 'r', encoding='utf-8') as f:
-                    self._data = json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.store_path, 'rb') as f:
+                    data = _loads(f.read())
+                if isinstance(data, dict):
+                    self._data = data
+            except (ValueError, IOError):
                 self._data = {}
 
+        if self.log_path.exists():
+            try:
+                with open(self.log_path, 'rb') as f:
+                    for line in f:
+                        self._replay(line)
+            except IOError:
+                pass
+
+    def _replay(self, line: bytes):
+        """重放单条日志记录（损坏的行直接跳过）"""
+        try:
+            record = _loads(line)
+        except ValueError:
+            return
+        op = record.get("op")
+        if op == "set":
+            self._data[record["k"]] = record["v"]
+        elif op == "del":
+            self._data.pop(record["k"], None)
+
+    def _append(self, record: dict):
+        """将一条日志记录交给后台线程写入"""
+        if self._worker is None:
+            # 线程只引用队列和写入端，不引用 store；store 被回收时由 finalizer 收尾
+            self._worker = threading.Thread(
+                target=_drain,
+                args=(self._write_q, self._writer),
+                name="token-store-writer",
+                daemon=True,
+            )
+            self._worker.start()
+            self._finalizer = weakref.finalize(self, _stop_worker, self._write_q, self._worker)
+        self._write_q.put(_dumps(record) + b"\n")
+
+    def flush(self):
+        """
+        等待已入队的日志全部写入并 fsync
+
+        Raises:
+            OSError: 后台线程写入日志失败（抛出自上次 flush 以来的第一个错误）
+        """
+        if self._worker is None:
+            return
+        done = threading.Event()
+        self._write_q.put(done)
+        done.wait()
+        error, self._writer.error = self._writer.error, None
+        if error is not None:
+            raise error
+
+    def compact(self):
+        """将当前数据原子写入快照，并清空操作日志"""
+        self.flush()
+        with self._writer.lock:
+            if self._stream is not None:
+                # 流后端没有独立快照，直接用每键一条 set 记录重写整个流
+                self._stream.seek(0)
+                self._stream.truncate()
+                for key, value in self._data.items():
+                    self._stream.write(_dumps({"op": "set", "k": key, "v": value}) + b"\n")
+                self._stream.flush()
+                self._writer.reset()
+                return
+
+            tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(self._data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.store_path)
+            # 快照落盘后才删除日志：中途崩溃时旧日志在新快照上重放结果不变
+            self._writer.reset()
+
     def save(self):
-        """保存数据到文件"""
-        with open(self.store_path, 'w', encoding='utf-8') as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        """保存数据到文件（合并日志为快照）"""
+        self.compact()
+
+    def close(self):
+        """停止后台写线程并关闭日志文件（流后端由调用方负责关闭）"""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._worker = None
 
     def set(self, key: str, value: dict):
         """设置键值对"""
         self._data[key] = value
-        self.save()
+        self._append({"op": "set", "k": key, "v": value})
 
     def get(self, key: str) -> Optional[dict]:
         """获取值"""
@@ -56,14 +283,14 @@ class TokenStore:
         """删除键值对"""
         if key in self._data:
             del self._data[key]
-            self.save()
+            self._append({"op": "del", "k": key})
             return True
         return False
 
     def clear(self):
         """清空所有数据"""
         self._data = {}
-        self.save()
+        self.compact()
 
     def all(self) -> Dict[str, dict]:
         """获取所有数据"""
@@ -85,7 +85,7 @@ AGENT_DOCUMENTATION = {
                     "model": {"type": "string", "required": False, "default": "vits-zh-hf-fanchen-C", "description": "TTS 模型"},
                     "voice_id": {"type": "integer", "required": False, "default": 77, "description": "音色 ID"},
                     "speed": {"type": "number", "required": False, "default": 1.0, "description": "语速 (0.5-2.0)"},
-                    "volume_db": {"type": "number", "required": False, "default": 25, "description": "音量 (dB)"}
+                    "volume_db": {"type": "number", "required": False, "default": 25, "description": "音量增益 (dB)，-60 到 60；L2 归一化后乘以 10^(dB/20)，0 表示不调整"}
                 }
             },
             "response": {
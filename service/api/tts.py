@@ -63,7 +63,7 @@ async def synthesize(request: TTSSynthesizeRequest):
     - **model**: TTS 模型选择
     - **voice_id**: 音色 ID
     - **speed**: 语速 (0.5-2.0，默认 1.0)
-    - **volume_db**: 音量增益 dB (-60 到 60，默认 25)
+    - **volume_db**: 音量增益 dB (-60 到 60，默认 25；L2 归一化后乘以 10^(dB/20)，0 表示不调整)
     - **format**: 输出格式 (wav, mp3, flac)
     - **sample_rate**: 采样率 (8000-96000，默认 44100)
 
@@ -5,11 +5,21 @@ API Request Models
 Pydantic 请求数据模型。
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from enum import Enum
 
 
+class _RequestModel(BaseModel):
+    """请求模型基类：不可变、拒绝未知字段、不重复校验"""
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        str_strip_whitespace=True,
+        revalidate_instances="never",
+    )
+
+
 class ASRModel(str, Enum):
     """ASR 模型选择"""
     PARAFORMER_ZH = "paraformer-zh"
@@ -31,15 +41,15 @@ class AudioFormat(str, Enum):
     FLAC = "flac"
 
 
-class ASRTranscribeRequest(BaseModel):
+class ASRTranscribeRequest(_RequestModel):
     """ASR 转写请求"""
     model: ASRModel = ASRModel.PARAFORMER_ZH
     enable_diarization: bool = False
     language: str = "zh"
     response_format: str = "json"
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "model": "paraformer-zh",
                 "enable_diarization": False,
@@ -47,20 +57,24 @@ class ASRTranscribeRequest(BaseModel):
                 "response_format": "json"
             }
         }
+    )
 
 
-class TTSSynthesizeRequest(BaseModel):
+class TTSSynthesizeRequest(_RequestModel):
     """TTS 合成请求"""
     text: str = Field(..., min_length=1, max_length=5000)
     model: TTSModel = TTSModel.VITS_ZH_FANCHEN_C
     voice_id: int = 77
     speed: float = Field(default=1.0, ge=0.5, le=2.0)
-    volume_db: float = Field(default=25.0, ge=-60.0, le=60.0)
+    volume_db: float = Field(
+        default=25.0, ge=-60.0, le=60.0,
+        description="音量增益 (dB)：L2 归一化后乘以 10^(dB/20)，0 表示不调整",
+    )
     format: AudioFormat = AudioFormat.WAV
     sample_rate: int = Field(default=44100, ge=8000, le=96000)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "text": "你好，这是语音合成的测试",
                 "model": "vits-zh-hf-fanchen-C",
@@ -71,9 +85,10 @@ class TTSSynthesizeRequest(BaseModel):
                 "sample_rate": 44100
             }
         }
+    )
 
 
-class VoiceFilterRequest(BaseModel):
+class VoiceFilterRequest(_RequestModel):
     """音色筛选请求"""
     model: Optional[TTSModel] = None
     gender: Optional[str] = None
@@ -89,15 +104,16 @@ class SpeakerEngine(str, Enum):
     MOCK = "mock"
 
 
-class SpeakerDiarizeRequest(BaseModel):
+class SpeakerDiarizeRequest(_RequestModel):
     """说话人分离请求"""
     engine: SpeakerEngine = SpeakerEngine.CAMPLUS
     num_speakers: Optional[int] = Field(default=None, ge=1, le=20)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "engine": "cam++",
                 "num_speakers": 2
             }
         }
+    )
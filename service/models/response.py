@@ -5,12 +5,20 @@ API Response Models
 Pydantic 响应数据模型。
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime, timezone
 
 
-class SpeakerSegment(BaseModel):
+class _ResponseModel(BaseModel):
+    """响应模型基类：构造后不可变、不重复校验"""
+    model_config = ConfigDict(
+        frozen=True,
+        revalidate_instances="never",
+    )
+
+
+class SpeakerSegment(_ResponseModel):
     """说话人片段"""
     speaker_id: str
     text: str = ""
@@ -19,7 +27,7 @@ class SpeakerSegment(BaseModel):
     confidence: float = 1.0
 
 
-class ASRResult(BaseModel):
+class ASRResult(_ResponseModel):
     """ASR 转写结果"""
     success: bool
     text: Optional[str] = None
@@ -37,7 +45,7 @@ class ASRResult(BaseModel):
     error: Optional[str] = None
 
 
-class TTSResult(BaseModel):
+class TTSResult(_ResponseModel):
     """TTS 合成结果"""
     success: bool
     audio_url: Optional[str] = None
@@ -51,7 +59,7 @@ class TTSResult(BaseModel):
     error: Optional[str] = None
 
 
-class VoiceInfo(BaseModel):
+class VoiceInfo(_ResponseModel):
     """音色信息"""
     id: int
     name: str
@@ -64,14 +72,14 @@ class VoiceInfo(BaseModel):
     tags: List[str] = []
 
 
-class VoiceListResponse(BaseModel):
+class VoiceListResponse(_ResponseModel):
     """音色列表响应"""
     voices: List[VoiceInfo]
     pagination: dict
     filters_applied: Optional[dict] = None
 
 
-class ModelInfo(BaseModel):
+class ModelInfo(_ResponseModel):
     """模型信息"""
     id: str
     name: str
@@ -82,12 +90,12 @@ class ModelInfo(BaseModel):
     default: bool = False
 
 
-class ModelListResponse(BaseModel):
+class ModelListResponse(_ResponseModel):
     """模型列表响应"""
     models: List[ModelInfo]
 
 
-class ServiceStatus(BaseModel):
+class ServiceStatus(_ResponseModel):
     """服务状态"""
     status: str
     version: str
@@ -98,14 +106,14 @@ class ServiceStatus(BaseModel):
     request_stats: Optional[dict] = None
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(_ResponseModel):
     """健康检查响应"""
     status: str
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     version: str
 
 
-class SpeakerDiarizeSegment(BaseModel):
+class SpeakerDiarizeSegment(_ResponseModel):
     """说话人分离片段"""
     speaker_id: str
     start_time: float
@@ -113,7 +121,7 @@ class SpeakerDiarizeSegment(BaseModel):
     confidence: float = 1.0
 
 
-class SpeakerDiarizeResult(BaseModel):
+class SpeakerDiarizeResult(_ResponseModel):
     """说话人分离结果"""
     success: bool
     audio_path: Optional[str] = None
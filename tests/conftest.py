@@ -10,8 +10,9 @@ import sys
 from pathlib import Path
 
 # 动态添加项目根目录到 sys.path（确保在 tests 目录之前）
+# 测试模块无需再各自修改 sys.path
 FILE = Path(__file__).resolve()
-ROOT = FILE.parents[2] / "exomind-model"
+ROOT = FILE.parents[1]
 
 # 将 ROOT 放到 sys.path 最前面，覆盖 pytest 添加的 tests 目录
 if str(ROOT) in sys.path:
@@ -21,6 +22,21 @@ sys.path.insert(0, str(ROOT))
 import pytest
 from httpx import AsyncClient, ASGITransport
 from service.main import app
+from privacy_gateway.pii.detector import PIIDetector
+from privacy_gateway.pii.tokenizer import PIITokenizer, reset_tokenizer
+
+
+# 依赖 sherpa-onnx 真实推理环境的测试（可用 -m "not sherpa" 排除）
+SHERPA_MODULES = {"test_tts_integration.py"}
+SHERPA_CLASSES = {"TestSherpaTTSClient"}
+
+
+def pytest_collection_modifyitems(config, items):
+    """为依赖 sherpa-onnx 的测试打上 sherpa 标记"""
+    for item in items:
+        cls = getattr(item, "cls", None)
+        if item.path.name in SHERPA_MODULES or (cls is not None and cls.__name__ in SHERPA_CLASSES):
+            item.add_marker(pytest.mark.sherpa)
 
 
 @pytest.fixture(scope="session")
@@ -43,3 +59,16 @@ async def client():
 def sample_audio_bytes():
     """模拟音频字节"""
     return b"RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00D\xac\x00\x00\x88X\x01\x00\x02\x00\x10\x00data\x00\x00\x00\x00"
+
+
+@pytest.fixture(scope="session")
+def pii_detector():
+    """PII 检测器（无状态，整个会话共享）"""
+    return PIIDetector()
+
+
+@pytest.fixture
+def pii_tokenizer():
+    """PII Tokenizer（有状态，每个测试重置）"""
+    reset_tokenizer()
+    return PIITokenizer()
@@ -12,6 +12,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from asr import FunASRClient, ASRResult, SpeakerSegment
+from asr.funasr_client import ModelKind
 
 
 class TestSpeakerSegment:
@@ -101,6 +102,7 @@ class TestFunASRClientRecognize:
         """创建带模拟模型的客户端（跳过模型加载）"""
         client = FunASRClient.__new__(FunASRClient)
         client._model_name = 'paraformer-zh'
+        client._model_kind = ModelKind.PARAFORMER_ZH
         client._device = 'cpu'
         client._enable_diarization = True
         client._model_instance = mock_model
@@ -182,6 +184,22 @@ class TestFunASRClientRecognize:
         assert result.num_speakers == 1
         assert len(result.speaker_segments) == 2
 
+    def test_transcribe_array_in_memory(self, client_with_mock, mock_model):
+        """测试内存数组直传：int16 (N, 1) 转为一维 float32，不经过文件"""
+        import numpy as np
+
+        mock_model.generate.return_value = [{"text": "内存转写"}]
+        audio = np.array([[0], [16384], [-32768]], dtype=np.int16)
+
+        text = client_with_mock.transcribe_array(audio, 16000)
+
+        assert text == "内存转写"
+        call_kwargs = mock_model.generate.call_args[1]
+        assert call_kwargs["fs"] == 16000
+        fed = call_kwargs["input"]
+        assert fed.dtype == np.float32
+        assert fed.tolist() == [0.0, 0.5, -1.0]
+
 
 class TestFunASRClientDiarizationFlag:
     """测试 FunASRClient 说话人分离标志"""
@@ -190,6 +208,7 @@ class TestFunASRClientDiarizationFlag:
         """测试初始化时启用说话人分离（跳过模型加载）"""
         client = FunASRClient.__new__(FunASRClient)
         client._model_name = 'paraformer-zh'
+        client._model_kind = ModelKind.PARAFORMER_ZH
         client._device = 'cpu'
         client._enable_diarization = True
         client._model_instance = MagicMock()
@@ -199,6 +218,7 @@ class TestFunASRClientDiarizationFlag:
         """测试初始化时禁用说话人分离（跳过模型加载）"""
         client = FunASRClient.__new__(FunASRClient)
         client._model_name = 'paraformer-zh'
+        client._model_kind = ModelKind.PARAFORMER_ZH
         client._device = 'cpu'
         client._enable_diarization = False
         client._model_instance = MagicMock()
@@ -208,6 +228,7 @@ class TestFunASRClientDiarizationFlag:
         """测试 recognize() 中覆盖 diarization 设置"""
         client = FunASRClient.__new__(FunASRClient)
         client._model_name = 'paraformer-zh'
+        client._model_kind = ModelKind.PARAFORMER_ZH
         client._device = 'cpu'
         client._enable_diarization = False
         mock_model = MagicMock()
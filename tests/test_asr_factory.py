@@ -0,0 +1,107 @@
+"""ASRClientFactory 客户端缓存单元测试"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from asr import ASRClient, ASRClientFactory
+
+
+class FakeClient(ASRClient):
+    """记录构造次数的假客户端"""
+
+    created = 0
+
+    def __init__(self, **kwargs):
+        type(self).created += 1
+        self.kwargs = kwargs
+
+    @property
+    def name(self):
+        return "Fake"
+
+    @property
+    def is_available(self):
+        return True
+
+    def transcribe(self, audio_path: str) -> str:
+        return ""
+
+    def transcribe_audio_data(self, audio_data) -> str:
+        return ""
+
+
+class BrokenClient(FakeClient):
+    """首选引擎初始化失败"""
+
+    def __init__(self, **kwargs):
+        raise RuntimeError("模型加载失败")
+
+
+@pytest.fixture
+def factory():
+    """注册假引擎并清空缓存"""
+    FakeClient.created = 0
+    ASRClientFactory.clear_cache()
+    with patch.dict(ASRClientFactory._engines, {'fake': FakeClient}):
+        yield ASRClientFactory
+    ASRClientFactory.clear_cache()
+
+
+class TestClientCache:
+    """测试 create_with_fallback 的客户端缓存"""
+
+    def test_same_config_reuses_client(self, factory):
+        first = factory.create_with_fallback('fake', device='cpu')
+        second = factory.create_with_fallback('fake', device='cpu')
+        assert first is second
+        assert FakeClient.created == 1
+
+    def test_different_config_creates_new_client(self, factory):
+        cpu = factory.create_with_fallback('fake', device='cpu')
+        cuda = factory.create_with_fallback('fake', device='cuda')
+        assert cpu is not cuda
+        assert FakeClient.created == 2
+
+    def test_use_cache_false_bypasses_cache(self, factory):
+        first = factory.create_with_fallback('fake', device='cpu')
+        second = factory.create_with_fallback('fake', use_cache=False, device='cpu')
+        assert first is not second
+        assert FakeClient.created == 2
+
+    def test_least_recently_used_is_evicted(self, factory):
+        size = factory.CLIENT_CACHE_SIZE
+        oldest = factory.create_with_fallback('fake', index=0)
+        for i in range(1, size + 1):
+            factory.create_with_fallback('fake', index=i)
+        assert factory.create_with_fallback('fake', index=0) is not oldest
+        assert FakeClient.created == size + 2
+
+    def test_fallback_client_is_not_cached(self, factory):
+        engines = {'funasr': BrokenClient, 'moss': FakeClient}
+        with patch.dict(factory._engines, engines):
+            first = factory.create_with_fallback('funasr', api_key='key')
+            second = factory.create_with_fallback('funasr', api_key='key')
+        assert isinstance(first, FakeClient)
+        assert first is not second
+        assert FakeClient.created == 2
+
+
+class TestClientLock:
+    """测试共享客户端的互斥锁"""
+
+    def test_lock_is_per_client(self, factory):
+        client = factory.create_with_fallback('fake')
+        other = factory.create_with_fallback('fake', use_cache=False)
+        assert client.lock is client.lock
+        assert client.lock is not other.lock
+
+    def test_cached_client_shares_lock(self, factory):
+        first = factory.create_with_fallback('fake', device='cpu')
+        second = factory.create_with_fallback('fake', device='cpu')
+        assert first.lock is second.lock
@@ -86,6 +86,15 @@ class TestTTSRequestModel:
         request = TTSSynthesizeRequest(text=long_text)
         assert len(request.text) == 5000
 
+    def test_frozen_and_extra_forbidden(self):
+        """测试请求不可修改且拒绝未知字段"""
+        request = TTSSynthesizeRequest(text="测试")
+        with pytest.raises(ValidationError):
+            request.speed = 1.5
+
+        with pytest.raises(ValidationError):
+            TTSSynthesizeRequest(text="测试", unknown_field=1)
+
 
 class TestResponseModels:
     """响应模型测试"""
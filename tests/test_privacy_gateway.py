@@ -15,10 +15,8 @@ ROOT = FILE.parents[2] / "exomind-model"
 sys.path.insert(0, str(ROOT))
 
 from privacy_gateway.pii.patterns import PIIType, detect_pii_type
-from privacy_gateway.pii.detector import PIIDetector, get_detector
-from privacy_gateway.pii.tokenizer import PIITokenizer, get_tokenizer, reset_tokenizer
 from privacy_gateway.storage.token_store import TokenStore
-import tempfile
+import io
 import json
 
 
@@ -47,6 +45,11 @@ class TestPIIPatterns:
         assert detect_pii_type("6222021234567890") == PIIType.CREDIT_CARD
         assert detect_pii_type("6212345678901234") == PIIType.CREDIT_CARD
 
+    def test_fullwidth_digits(self):
+        """测试全角数字（中文输入法常见）"""
+        assert detect_pii_type("１３８１２３４５６７８") == PIIType.PHONE
+        assert detect_pii_type("１１０１０１１９９００１０１１２３Ｘ") == PIIType.ID_CARD
+
     def test_email_detection(self):
         """测试邮箱检测"""
         assert detect_pii_type("user@example.com") == PIIType.EMAIL
@@ -56,109 +59,126 @@ class TestPIIPatterns:
 class TestPIIDetector:
     """PII 检测器测试"""
 
-    def setup_method(self):
-        """每个测试前重置检测器"""
-        self.detector = PIIDetector()
-
-    def test_detect_phone(self):
+    def test_detect_phone(self, pii_detector):
         """测试检测手机号"""
         text = "张三的手机号是13812345678"
-        results = self.detector.detect(text)
+        results = pii_detector.detect(text)
 
         assert len(results) == 1
         assert results[0].value == "13812345678"
         assert results[0].pii_type == PIIType.PHONE
 
-    def test_detect_multiple_pii(self):
+    def test_detect_multiple_pii(self, pii_detector):
         """测试检测多个 PII"""
         text = "张三的手机号是13812345678，邮箱是zhangsan@email.com"
-        results = self.detector.detect(text)
+        results = pii_detector.detect(text)
 
         assert len(results) == 2
         values = [r.value for r in results]
         assert "13812345678" in values
         assert "zhangsan@email.com" in values
 
-    def test_detect_no_pii(self):
+    def test_detect_fullwidth_phone(self, pii_detector):
+        """测试检测全角数字手机号，value 与位置对应原文"""
+        text = "张三的手机号是１３８１２３４５６７８"
+        results = pii_detector.detect(text)
+
+        assert len(results) == 1
+        assert results[0].value == "１３８１２３４５６７８"
+        assert results[0].pii_type == PIIType.PHONE
+        assert text[results[0].start:results[0].end] == results[0].value
+        assert pii_detector.has_pii(text) is True
+
+    def test_detect_no_pii(self, pii_detector):
         """测试无 PII 情况"""
         text = "今天天气很好，适合出去散步"
-        results = self.detector.detect(text)
+        results = pii_detector.detect(text)
         assert len(results) == 0
 
-    def test_detect_types(self):
+    def test_detect_unique(self, pii_detector):
+        """测试相同 PII 合并为一条结果"""
+        text = "我的手机号是13812345678，朋友的手机号也是13812345678"
+        results = pii_detector.detect_unique(text)
+
+        assert len(results) == 1
+        assert results[0].value == "13812345678"
+        assert results[0].pii_type == PIIType.PHONE
+        assert results[0].spans == [(6, 17), (26, 37)]
+
+    def test_detect_types(self, pii_detector):
         """测试检测 PII 类型"""
         text = "手机13812345678，身份证110101199001011234"
-        types = self.detector.detect_types(text)
+        types = pii_detector.detect_types(text)
 
         assert PIIType.PHONE in types
         assert PIIType.ID_CARD in types
 
-    def test_has_pii(self):
+    def test_has_pii(self, pii_detector):
         """测试 PII 存在性检查"""
-        assert self.detector.has_pii("手机号13812345678") is True
-        assert self.detector.has_pii("今天天气很好") is False
+        assert pii_detector.has_pii("手机号13812345678") is True
+        assert pii_detector.has_pii("今天天气很好") is False
 
 
 class TestPIITokenizer:
     """PII Tokenizer 测试"""
 
-    def setup_method(self):
-        """每个测试前重置 tokenizer"""
-        reset_tokenizer()
-
-    def test_tokenize_single(self):
+    def test_tokenize_single(self, pii_tokenizer):
         """测试单个 PII token 化"""
-        tokenizer = PIITokenizer()
-        token = tokenizer.tokenize("13812345678", PIIType.PHONE)
+        token = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
 
         assert token == "[PII_PHONE_1]"
-        assert tokenizer.count() == 1
+        assert pii_tokenizer.count() == 1
 
-    def test_bijective_mapping(self):
+    def test_bijective_mapping(self, pii_tokenizer):
         """测试双射映射（一一对应）"""
-        tokenizer = PIITokenizer()
 
-        token1 = tokenizer.tokenize("13812345678", PIIType.PHONE)
-        token2 = tokenizer.tokenize("13812345678", PIIType.PHONE)
+        token1 = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
+        token2 = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
 
         # 同一个 PII 应该返回相同的 token
         assert token1 == token2
-        assert tokenizer.count() == 1
+        assert pii_tokenizer.count() == 1
 
-    def test_different_pii_same_type(self):
+    def test_different_pii_same_type(self, pii_tokenizer):
         """测试同类型不同 PII"""
-        tokenizer = PIITokenizer()
 
-        token1 = tokenizer.tokenize("13812345678", PIIType.PHONE)
-        token2 = tokenizer.tokenize("15987654321", PIIType.PHONE)
+        token1 = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
+        token2 = pii_tokenizer.tokenize("15987654321", PIIType.PHONE)
 
         # 不同 PII 应该返回不同的 token
         assert token1 != token2
-        assert tokenizer.count() == 2
+        assert pii_tokenizer.count() == 2
 
-    def test_restore(self):
+    def test_restore(self, pii_tokenizer):
         """测试还原"""
-        tokenizer = PIITokenizer()
 
-        token = tokenizer.tokenize("13812345678", PIIType.PHONE)
-        restored = tokenizer.restore(token)
+        token = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
+        restored = pii_tokenizer.restore(token)
 
         assert restored == "13812345678"
 
-    def test_restore_unknown_token(self):
+    def test_restore_unknown_token(self, pii_tokenizer):
         """测试还原未知 token"""
-        tokenizer = PIITokenizer()
-        restored = tokenizer.restore("[UNKNOWN_TOKEN]")
+        restored = pii_tokenizer.restore("[UNKNOWN_TOKEN]")
 
         # 未知 token 应返回原值
         assert restored == "[UNKNOWN_TOKEN]"
 
-    def test_get_pii_type(self):
+    def test_restore_all(self, pii_tokenizer):
+        """测试一次还原文本中的全部 token"""
+        phone = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
+        email = pii_tokenizer.tokenize("a@b.com", PIIType.EMAIL)
+
+        text = f"{phone} 和 {email}，再次 {phone}，未知 [PII_PHONE_99]"
+        restored = pii_tokenizer.restore_all(text)
+
+        assert restored == "13812345678 和 a@b.com，再次 13812345678，未知 [PII_PHONE_99]"
+
+    def test_get_pii_type(self, pii_tokenizer):
         """测试获取 PII 类型"""
-        tokenizer = PIITokenizer()
-        token = tokenizer.tokenize("13812345678", PIIType.PHONE)
+        token = pii_tokenizer.tokenize("13812345678", PIIType.PHONE)
 
-        pii_type = tokenizer.get_pii_type(token)
+        pii_type = pii_tokenizer.get_pii_type(token)
         assert pii_type == PIIType.PHONE
 
 
@@ -167,89 +187,123 @@ class TestTokenStore:
 
     def test_save_and_load(self):
         """测试保存和加载"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            store_path = Path(f.name)
+        buffer = io.BytesIO()
+        store = TokenStore(buffer)
 
-        try:
-            store = TokenStore(store_path)
-
-            # 设置数据
-            store.set("token1", {"value": "data1"})
-            store.set("token2", {"value": "data2"})
+        # 设置数据
+        store.set("token1", {"value": "data1"})
+        store.set("token2", {"value": "data2"})
 
-            # 验证数量
-            assert store.count() == 2
+        # 验证数量
+        assert store.count() == 2
 
-            # 加载新实例
-            new_store = TokenStore(store_path)
-            assert new_store.count() == 2
-            assert new_store.get("token1")["value"] == "data1"
-
-        finally:
-            store_path.unlink(missing_ok=True)
+        # 等待后台线程写完日志，再加载新实例
+        store.flush()
+        new_store = TokenStore(buffer)
+        assert new_store.count() == 2
+        assert new_store.get("token1")["value"] == "data1"
 
     def test_delete(self):
         """测试删除"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            store_path = Path(f.name)
-
-        try:
-            store = TokenStore(store_path)
-            store.set("token1", {"value": "data1"})
-
-            # 删除
-            result = store.delete("token1")
-            assert result is True
-            assert store.count() == 0
+        store = TokenStore(io.BytesIO())
+        store.set("token1", {"value": "data1"})
 
-            # 删除不存在的键
-            result = store.delete("nonexistent")
-            assert result is False
+        # 删除
+        result = store.delete("token1")
+        assert result is True
+        assert store.count() == 0
 
-        finally:
-            store_path.unlink(missing_ok=True)
+        # 删除不存在的键
+        result = store.delete("nonexistent")
+        assert result is False
 
     def test_clear(self):
         """测试清空"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            store_path = Path(f.name)
-
-        try:
-            store = TokenStore(store_path)
-            store.set("token1", {"value": "data1"})
+        buffer = io.BytesIO()
+        store = TokenStore(buffer)
+        store.set("token1", {"value": "data1"})
+        store.set("token2", {"value": "data2"})
+
+        store.clear()
+        assert store.count() == 0
+        assert buffer.getvalue() == b""
+
+    def test_compact(self, tmp_path):
+        """测试日志合并为快照"""
+        store_path = tmp_path / "tokens.json"
+        log_path = tmp_path / "tokens.json.log"
+
+        store = TokenStore(store_path)
+        store.set("token1", {"value": "data1"})
+        store.set("token2", {"value": "data2"})
+        store.delete("token1")
+        store.flush()
+        assert log_path.exists()
+
+        store.compact()
+        assert not log_path.exists()
+        assert json.loads(store_path.read_text(encoding='utf-8')) == {
+            "token2": {"value": "data2"}
+        }
+
+        # 快照 + 新日志重放
+        store.set("token3", {"value": "data3"})
+        store.close()
+        new_store = TokenStore(store_path)
+        assert new_store.count() == 2
+        assert new_store.get("token1") is None
+        assert new_store.get("token3")["value"] == "data3"
+
+    def test_flush_raises_write_error(self, tmp_path):
+        """测试后台写入失败时 flush 抛出错误而不是卡死"""
+        store_path = tmp_path / "tokens.json"
+        # 日志路径是目录，打开写入必然失败
+        (tmp_path / "tokens.json.log").mkdir()
+
+        store = TokenStore(store_path)
+        store.set("token1", {"value": "data1"})
+        with pytest.raises(OSError):
+            store.flush()
+        with pytest.raises(OSError):
             store.set("token2", {"value": "data2"})
+            store.compact()
+        store.close()
+
+    def test_compact_keeps_log_until_snapshot_replaced(self, tmp_path, monkeypatch):
+        """测试快照替换失败时日志仍保留，数据不丢失"""
+        store_path = tmp_path / "tokens.json"
+        store = TokenStore(store_path)
+        store.set("token1", {"value": "data1"})
+        store.flush()
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
 
-            store.clear()
-            assert store.count() == 0
+        monkeypatch.setattr("privacy_gateway.storage.token_store.os.replace", failing_replace)
+        with pytest.raises(OSError):
+            store.compact()
+        store.close()
+        monkeypatch.undo()
 
-        finally:
-            store_path.unlink(missing_ok=True)
+        assert (tmp_path / "tokens.json.log").exists()
+        assert TokenStore(store_path).get("token1")["value"] == "data1"
 
 
 class TestIntegration:
     """集成测试"""
 
-    def setup_method(self):
-        """每个测试前重置"""
-        reset_tokenizer()
-
-    def test_protect_and_restore_flow(self):
+    def test_protect_and_restore_flow(self, pii_detector, pii_tokenizer):
         """测试完整的保护-还原流程"""
-        tokenizer = PIITokenizer()
-        detector = PIIDetector()
-
         # 原始文本
         original = "张三的手机号是13812345678，邮箱是zhangsan@email.com"
 
         # 保护
-        pii_results = detector.detect(original)
+        pii_results = pii_detector.detect(original)
         protected = original
-        tokens = {}
 
         for pii in pii_results:
-            token = tokenizer.tokenize(pii.value, pii.pi_type)
+            token = pii_tokenizer.tokenize(pii.value, pii.pii_type)
             protected = protected.replace(pii.value, token)
-            tokens[token] = pii.value
 
         # 验证保护后文本不含原始 PII
         assert "13812345678" not in protected
@@ -258,20 +312,15 @@ class TestIntegration:
         assert "[PII_EMAIL_1]" in protected
 
         # 还原
-        restored = protected
-        for token, original_value in tokens.items():
-            restored = restored.replace(token, original_value)
+        restored = pii_tokenizer.restore_all(protected)
 
         # 验证还原后文本与原始文本一致
         assert restored == original
 
-    def test_multiple_same_pii(self):
+    def test_multiple_same_pii(self, pii_detector, pii_tokenizer):
         """测试同一 PII 多次出现"""
-        tokenizer = PIITokenizer()
-        detector = PIIDetector()
-
         text = "我的手机号是13812345678，朋友的手机号也是13812345678"
-        results = detector.detect(text)
+        results = pii_detector.detect(text)
 
         assert len(results) == 2
         assert results[0].value == results[1].value
@@ -280,12 +329,12 @@ class TestIntegration:
         protected = text
         token_map = {}
         for pii in results:
-            token = tokenizer.tokenize(pii.value, pii.pi_type)
+            token = pii_tokenizer.tokenize(pii.value, pii.pii_type)
             protected = protected.replace(pii.value, token, 1)
             token_map[token] = pii.value
 
         # 检查 token 数量
-        assert tokenizer.count() == 1
+        assert pii_tokenizer.count() == 1
 
 
 # 运行测试
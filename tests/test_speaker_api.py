@@ -4,15 +4,9 @@
 """
 
 import pytest
-import tempfile
 import wave
-import os
-from pathlib import Path
 
-# 添加项目根目录到 Python 路径
-project_root = Path(__file__).parent.parent
-import sys
-sys.path.insert(0, str(project_root))
+import numpy as np
 
 
 def create_test_wav(path: str, duration: float = 3.0, sample_rate: int = 16000):
@@ -21,47 +15,44 @@ def create_test_wav(path: str, duration: float = 3.0, sample_rate: int = 16000):
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
-        # 生成简单的正弦波
-        import math
-        import struct
-        for i in range(int(duration * sample_rate)):
-            value = int(32767 * 0.5 * math.sin(2 * math.pi * 440 * i / sample_rate))
-            wf.writeframes(struct.pack('<h', value))
+        # 生成简单的正弦波（向量化一次生成全部采样）
+        t = np.arange(int(duration * sample_rate), dtype=np.float64)
+        samples = (32767 * 0.5 * np.sin(2 * np.pi * 440 * t / sample_rate)).astype('<i2')
+        wf.writeframes(samples.tobytes())
+
+
+@pytest.fixture(scope="module")
+def test_wav_file(tmp_path_factory):
+    """创建测试 WAV 文件（整个模块共用一份，目录由 pytest 清理）
+
+    Returns:
+        (文件路径, 文件字节)，字节只读取一次供各测试复用
+    """
+    path = tmp_path_factory.mktemp("wav") / "test.wav"
+    create_test_wav(str(path), duration=3.0)
+    return str(path), path.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """创建测试客户端（整个模块共用一个，lifespan 只启动/关闭一次）"""
+    from service.main import app
+    from fastapi.testclient import TestClient
+    with TestClient(app) as c:
+        yield c
 
 
 class TestSpeakerAPI:
     """Speaker API 测试类"""
 
-    @pytest.fixture
-    def test_wav_file(self):
-        """创建测试 WAV 文件"""
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            temp_path = f.name
-        create_test_wav(temp_path, duration=3.0)
-        yield temp_path
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-
-    @pytest.fixture
-    def client(self):
-        """创建测试客户端"""
-        from service.main import app
-        from fastapi.testclient import TestClient
-        return TestClient(app)
-
     def test_diarize_endpoint_exists(self, client):
-        """测试 diarize 端点存在"""
-        response = client.post(
-            "/v1/speaker/diarize",
-            files={"audio": ("test.wav", b"", "audio/wav")}
-        )
-        # 应该返回 422 (验证错误) 而不是 404
-        assert response.status_code in [400, 422, 500]
+        """测试 diarize 端点已注册（直接检查路由表，不走请求解析）"""
+        # 按端点函数名反查路径；未注册时抛出 NoMatchFound
+        assert client.app.url_path_for("diarize") == "/v1/speaker/diarize"
 
     def test_diarize_with_audio(self, client, test_wav_file):
         """测试带音频的说话人分离"""
-        with open(test_wav_file, 'rb') as f:
-            audio_data = f.read()
+        _, audio_data = test_wav_file
 
         response = client.post(
             "/v1/speaker/diarize",
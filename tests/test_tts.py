@@ -3,35 +3,115 @@
 测试 TTSClient 抽象基类和 SherpaTTSClient 实现。
 """
 
+import dataclasses
+from pathlib import Path
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import numpy as np
-import sys
-from pathlib import Path
-
-# 添加项目根目录到 Python 路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 # 导入 TTS 模块
 from tts.base import TTSClient, TTSResult
 
+# 测试用音频常量（模块加载时构造一次，设为只读防止被测试意外修改）
+_AUDIO1 = np.array([0.1], dtype=np.float32)
+_AUDIO2 = np.array([0.1, 0.2], dtype=np.float32)
+_AUDIO3 = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+for _audio in (_AUDIO1, _AUDIO2, _AUDIO3):
+    _audio.setflags(write=False)
+
+
+class _MockTTSClient(TTSClient):
+    """测试用 TTS 客户端（返回值由类属性控制，子类只需覆盖属性）"""
+
+    NAME = "mock-tts"
+    SAMPLE_RATE = 16000
+    NUM_SPEAKERS = 10
+    AVAILABLE = True
+
+    @property
+    def name(self):
+        return self.NAME
+
+    @property
+    def sample_rate(self):
+        return self.SAMPLE_RATE
+
+    @property
+    def num_speakers(self):
+        return self.NUM_SPEAKERS
+
+    def generate(self, text, speaker_id=None, **kwargs):
+        return TTSResult(
+            audio=_AUDIO1,
+            sample_rate=self.SAMPLE_RATE,
+            duration=1 / self.SAMPLE_RATE,
+            text=text,
+            speaker_id=speaker_id,
+        )
+
+    def is_available(self):
+        return self.AVAILABLE
+
+    def close(self):
+        pass
+
+
+class _MockEngine(_MockTTSClient):
+    NAME = "mock-engine"
+    SAMPLE_RATE = 24000
+    NUM_SPEAKERS = 100
+
+
+class _TestEngine(_MockTTSClient):
+    NAME = "test-engine"
+    NUM_SPEAKERS = None
+
+
+class _FailingEngine(_MockTTSClient):
+    NAME = "fail"
+    NUM_SPEAKERS = None
+    AVAILABLE = False
+
+    def generate(self, text, **kwargs):
+        raise RuntimeError("Engine failed")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _register_mock_engines():
+    """一次性注册测试引擎，模块结束后恢复工厂注册表"""
+    from tts.factory import TTSClientFactory
+
+    engines = dict(TTSClientFactory._engines)
+    aliases = dict(TTSClientFactory._aliases)
+
+    TTSClientFactory.register("mock", _MockTTSClient)
+    TTSClientFactory.register("mock-engine", _MockEngine)
+    TTSClientFactory.register("test-engine", _TestEngine)
+    TTSClientFactory.register("fail", _FailingEngine)
+    TTSClientFactory.register_alias("alias", "test-engine")
+    yield
+
+    TTSClientFactory._engines = engines
+    TTSClientFactory._aliases = aliases
+
 
 class TestTTSResult:
     """测试 TTSResult 数据类"""
 
     def test_create_result(self):
         """测试创建 TTSResult"""
-        audio = np.array([0.1, 0.2, 0.3], dtype=np.float32)
         result = TTSResult(
-            audio=audio,
+            audio=_AUDIO3,
             sample_rate=16000,
             duration=0.0001875,
             text="你好",
             speaker_id=77,
         )
 
-        assert result.audio is audio
+        # audio 是传入数组的只读视图，不复制数据
+        assert np.shares_memory(result.audio, _AUDIO3)
+        np.testing.assert_array_equal(result.audio, _AUDIO3)
         assert result.sample_rate == 16000
         assert result.duration == 0.0001875
         assert result.text == "你好"
@@ -39,9 +119,8 @@ class TestTTSResult:
 
     def test_result_without_speaker(self):
         """测试不带说话人 ID 的结果"""
-        audio = np.array([0.1, 0.2], dtype=np.float32)
         result = TTSResult(
-            audio=audio,
+            audio=_AUDIO2,
             sample_rate=16000,
             duration=0.000125,
             text="测试",
@@ -51,9 +130,8 @@ class TestTTSResult:
 
     def test_audio_properties(self):
         """测试音频属性"""
-        audio = np.array([0.5, -0.5, 0.25], dtype=np.float32)
         result = TTSResult(
-            audio=audio,
+            audio=_AUDIO3,
             sample_rate=16000,
             duration=0.0001875,
             text="测试",
@@ -62,6 +140,48 @@ class TestTTSResult:
         assert result.audio.dtype == np.float32
         assert len(result.audio) == 3
 
+    def test_concat(self):
+        """测试拼接多段结果"""
+        parts = [
+            TTSResult(audio=_AUDIO1, sample_rate=10, duration=0.1, text="一", speaker_id=1),
+            TTSResult(audio=_AUDIO2, sample_rate=10, duration=0.2, text="二", speaker_id=1),
+        ]
+        result = TTSResult.concat(parts)
+        np.testing.assert_array_equal(result.audio, np.concatenate([_AUDIO1, _AUDIO2]))
+        assert result.duration == pytest.approx(0.3)
+        assert result.text == "一二"
+        assert result.speaker_id == 1
+
+        parts.append(TTSResult(audio=_AUDIO1, sample_rate=10, duration=0.1, text="三", speaker_id=2))
+        assert TTSResult.concat(parts).speaker_id is None
+
+        with pytest.raises(ValueError):
+            TTSResult.concat([])
+        with pytest.raises(ValueError):
+            TTSResult.concat([parts[0], TTSResult(audio=_AUDIO1, sample_rate=16000, duration=0.0, text="")])
+
+    def test_audio_read_only(self):
+        """测试音频构造后只读，视图与字节不复制修改原数据"""
+        audio = np.array([0.5, -0.5], dtype=np.float32)
+        result = TTSResult(audio=audio, sample_rate=16000, duration=0.000125, text="测试")
+
+        with pytest.raises(ValueError):
+            result.audio[0] = 0.0
+        # 调用方的数组保持可写
+        assert audio.flags.writeable
+        assert np.shares_memory(result.audio, audio)
+
+        view = result.audio_view()
+        assert np.shares_memory(view, audio)
+        assert not view.flags.writeable
+
+        assert result.audio_bytes == audio.tobytes()
+        assert result.audio_bytes is result.audio_bytes
+
+        # 结果不可变，audio_bytes 缓存不会过期
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.audio = np.zeros(2, dtype=np.float32)
+
 
 class TestTTSClient:
     """测试 TTSClient 抽象基类"""
@@ -74,36 +194,7 @@ class TestTTSClient:
 
     def test_concrete_implementation(self):
         """测试具体实现类"""
-        # 创建一个 mock 实现
-        class MockTTSClient(TTSClient):
-            @property
-            def name(self):
-                return "mock-tts"
-
-            @property
-            def sample_rate(self):
-                return 16000
-
-            @property
-            def num_speakers(self):
-                return 10
-
-            def generate(self, text, **kwargs):
-                return TTSResult(
-                    audio=np.array([0.1], dtype=np.float32),
-                    sample_rate=16000,
-                    duration=0.0000625,
-                    text=text,
-                    speaker_id=0,
-                )
-
-            def is_available(self):
-                return True
-
-            def close(self):
-                pass
-
-        client = MockTTSClient()
+        client = _MockTTSClient()
         assert client.name == "mock-tts"
         assert client.sample_rate == 16000
         assert client.num_speakers == 10
@@ -111,64 +202,21 @@ class TestTTSClient:
 
     def test_context_manager(self):
         """测试上下文管理器"""
-        class MockTTSClient(TTSClient):
-            @property
-            def name(self):
-                return "mock-tts"
-
-            @property
-            def sample_rate(self):
-                return 16000
-
-            @property
-            def num_speakers(self):
-                return None
-
-            def generate(self, text, **kwargs):
-                return TTSResult(
-                    audio=np.array([0.1], dtype=np.float32),
-                    sample_rate=16000,
-                    duration=0.0000625,
-                    text=text,
-                )
-
-            def is_available(self):
-                return True
-
-            def close(self):
-                pass
-
-        with MockTTSClient() as client:
+        with _MockTTSClient() as client:
             assert client.is_available()
 
     def test_repr(self):
         """测试 __repr__"""
-        class MockTTSClient(TTSClient):
-            @property
-            def name(self):
-                return "mock-tts"
-
-            @property
-            def sample_rate(self):
-                return 16000
-
-            @property
-            def num_speakers(self):
-                return 5
-
-            def generate(self, text, **kwargs):
-                pass
-
-            def is_available(self):
-                return True
-
-            def close(self):
-                pass
-
-        client = MockTTSClient()
+        client = _MockTTSClient()
         assert "MockTTSClient" in repr(client)
         assert "mock-tts" in repr(client)
 
+    def test_generate_batch_default(self):
+        """测试默认批量生成逐条调用 generate 并保持顺序"""
+        results = _MockTTSClient().generate_batch(["一", "二", "三"], speaker_id=5)
+        assert [r.text for r in results] == ["一", "二", "三"]
+        assert all(r.speaker_id == 5 for r in results)
+
 
 class TestTTSClientFactory:
     """测试 TTSClientFactory 工厂类"""
@@ -186,63 +234,13 @@ class TestTTSClientFactory:
         """测试注册别名"""
         from tts.factory import TTSClientFactory
 
-        # 创建一个 mock 引擎类
-        class MockEngine(TTSClient):
-            @property
-            def name(self):
-                return "mock-engine"
-
-            @property
-            def sample_rate(self):
-                return 16000
-
-            @property
-            def num_speakers(self):
-                return None
-
-            def generate(self, text, **kwargs):
-                pass
-
-            def is_available(self):
-                return True
-
-            def close(self):
-                pass
-
-        TTSClientFactory.register("mock", MockEngine)
-        TTSClientFactory.register_alias("alias", "mock")
-
         assert "mock" in TTSClientFactory.available_engines()
+        assert TTSClientFactory._aliases["alias"] == "test-engine"
 
     def test_create_with_alias(self):
         """测试使用别名创建引擎"""
         from tts.factory import TTSClientFactory
 
-        class MockEngine(TTSClient):
-            @property
-            def name(self):
-                return "test-engine"
-
-            @property
-            def sample_rate(self):
-                return 16000
-
-            @property
-            def num_speakers(self):
-                return None
-
-            def generate(self, text, **kwargs):
-                pass
-
-            def is_available(self):
-                return True
-
-            def close(self):
-                pass
-
-        TTSClientFactory.register("test-engine", MockEngine)
-        TTSClientFactory.register_alias("alias", "test-engine")
-
         # 使用别名创建
         client = TTSClientFactory.create("alias")
         assert client.name == "test-engine"
@@ -260,106 +258,363 @@ class TestTTSClientFactory:
         """测试检查引擎可用性"""
         from tts.factory import TTSClientFactory
 
-        class MockEngine(TTSClient):
-            @property
-            def name(self):
-                return "mock"
+        assert TTSClientFactory.is_available("mock") is True
+        assert TTSClientFactory.is_available("fail") is False
 
-            @property
-            def sample_rate(self):
-                return 16000
+    def test_get_engine_info(self):
+        """测试获取引擎信息"""
+        from tts.factory import TTSClientFactory
 
-            @property
-            def num_speakers(self):
-                return None
+        info = TTSClientFactory.get_engine_info("mock-engine")
+        assert info["name"] == "mock-engine"
+        assert info["sample_rate"] == 24000
+        assert info["num_speakers"] == 100
+        assert info["available"] is True
 
-            def generate(self, text, **kwargs):
-                pass
 
-            def is_available(self):
-                return True
+@pytest.fixture
+def make_sherpa_client(tmp_path):
+    """构造不加载模型的 SherpaTTSClient
 
-            def close(self):
-                pass
+    走真实的 __init__，只把引擎加载替换为 Mock 引擎（每个字符输出一个 0.5 采样）；
+    关键字参数透传给构造函数，测试结束时自动 close。
+    """
+    from tts.sherpa_client import SherpaTTSClient
 
-        class FailingEngine(TTSClient):
-            @property
-            def name(self):
-                return "fail"
+    clients = []
 
-            @property
-            def sample_rate(self):
-                return 16000
+    def make(**kwargs):
+        engine = Mock(sample_rate=16000, num_speakers=1)
+        engine.generate.side_effect = lambda text, sid, speed: Mock(samples=[0.5] * len(text))
 
-            @property
-            def num_speakers(self):
-                return None
+        def fake_init_engine(self):
+            self._tts = engine
 
-            def generate(self, text, **kwargs):
-                raise RuntimeError("Engine failed")
+        kwargs.setdefault("model", "vits-zh-aishell3")
+        kwargs.setdefault("model_dir", str(tmp_path))
+        kwargs.setdefault("speaker_id", 0)
+        kwargs.setdefault("volume_db", 0.0)
+        kwargs.setdefault("quantized", False)
+        kwargs.setdefault("cache_size", 0)
+        with patch.object(SherpaTTSClient, "_init_engine", fake_init_engine):
+            client = SherpaTTSClient(**kwargs)
+        clients.append(client)
+        return client
 
-            def is_available(self):
-                return False
+    yield make
+    for client in clients:
+        client.close()
 
-            def close(self):
-                pass
 
-        TTSClientFactory.register("mock", MockEngine)
-        TTSClientFactory.register("fail", FailingEngine)
+class TestSherpaTTSClient:
+    """测试 SherpaTTSClient 实现"""
 
-        assert TTSClientFactory.is_available("mock") is True
-        assert TTSClientFactory.is_available("fail") is False
+    def test_model_not_found(self):
+        """测试模型不存在时的错误"""
+        from tts.sherpa_client import SherpaTTSClient
 
-    def test_get_engine_info(self):
-        """测试获取引擎信息"""
-        from tts.factory import TTSClientFactory
+        with pytest.raises(FileNotFoundError) as exc_info:
+            SherpaTTSClient(model="non-existent-model")
 
-        class MockEngine(TTSClient):
-            @property
-            def name(self):
-                return "mock-engine"
+        assert "Model not found" in str(exc_info.value)
 
-            @property
-            def sample_rate(self):
-                return 24000
+    def test_apply_volume_gain(self):
+        """测试音量增益：L2 归一化后乘以振幅倍数，静音保持不变"""
+        from tts.sherpa_client import SherpaTTSClient
 
-            @property
-            def num_speakers(self):
-                return 100
+        gain = SherpaTTSClient._db_to_gain(20.0)
+        assert gain == pytest.approx(10.0)
 
-            def generate(self, text, **kwargs):
-                pass
+        audio = np.array([3.0, 4.0], dtype=np.float32)
+        out = SherpaTTSClient._apply_volume_gain(audio, gain)
+        assert out.dtype == np.float32
+        np.testing.assert_allclose(out, [6.0, 8.0], rtol=1e-6)
 
-            def is_available(self):
-                return True
+        silence = np.zeros(4, dtype=np.float32)
+        assert not SherpaTTSClient._apply_volume_gain(silence, gain).any()
 
-            def close(self):
-                pass
+        # 安装了 SciPy 时使用 BLAS snrm2 求范数
+        with patch("tts.sherpa_client._blas_snrm2", return_value=lambda x: 2.0):
+            out = SherpaTTSClient._apply_volume_gain(np.array([1.0, 1.0], dtype=np.float32), gain)
+        np.testing.assert_allclose(out, [5.0, 5.0], rtol=1e-6)
 
-        TTSClientFactory.register("mock-engine", MockEngine)
+    def test_apply_volume_gain_modes(self):
+        """测试 peak / raw 增益模式"""
+        from tts.sherpa_client import SherpaTTSClient
 
-        info = TTSClientFactory.get_engine_info("mock-engine")
-        assert info["name"] == "mock-engine"
-        assert info["sample_rate"] == 24000
-        assert info["num_speakers"] == 100
-        assert info["available"] is True
+        # peak：默认音量对应满幅，低于默认值时按 dB 降低峰值，高于时不削波
+        db_to_gain = SherpaTTSClient._db_to_gain
+        default_db = SherpaTTSClient.DEFAULT_VOLUME_DB
+        for db, peak in ((default_db, 1.0), (default_db + 35.0, 1.0), (default_db - 20.0, 0.1)):
+            audio = np.array([0.25, -0.5], dtype=np.float32)
+            out = SherpaTTSClient._apply_volume_gain(audio, db_to_gain(db), "peak")
+            np.testing.assert_allclose(out, [peak / 2, -peak], rtol=1e-6)
 
+        audio = np.array([0.05, -0.2], dtype=np.float32)
+        out = SherpaTTSClient._apply_volume_gain(audio, 10.0, "raw")
+        np.testing.assert_allclose(out, [0.5, -1.0])
 
-class TestSherpaTTSClient:
-    """测试 SherpaTTSClient 实现"""
+        with pytest.raises(ValueError):
+            SherpaTTSClient(model="non-existent-model", gain_mode="loud")
 
-    def test_model_not_found(self):
-        """测试模型不存在时的错误"""
+    def test_default_gain_mode_is_l2(self, make_sherpa_client):
+        """测试默认增益模式为 L2 归一化，volume_db 按 dB 生效"""
+        client = make_sherpa_client()
+
+        quiet = client.generate("你好", volume_db=6.0).audio
+        loud = client.generate("你好", volume_db=20.0).audio
+        np.testing.assert_allclose(loud, [10.0 / np.sqrt(2)] * 2, rtol=1e-6)
+        np.testing.assert_allclose(loud / quiet, [10 ** (14.0 / 20.0)] * 2, rtol=1e-5)
+
+    def test_samples_to_array(self):
+        """测试采样转换：列表转 float32，float32 数组零拷贝"""
         from tts.sherpa_client import SherpaTTSClient
 
-        with pytest.raises(FileNotFoundError) as exc_info:
-            SherpaTTSClient(model="non-existent-model")
+        from_list = SherpaTTSClient._samples_to_array([0.1, 0.2, 0.3])
+        np.testing.assert_array_equal(from_list, _AUDIO3)
 
-        assert "Model not found" in str(exc_info.value)
+        assert SherpaTTSClient._samples_to_array(_AUDIO3) is _AUDIO3
+
+    def test_find_model_dir(self, tmp_path, monkeypatch, make_sherpa_client):
+        """测试模型目录查找：嵌套同名子目录、模糊匹配，结果缓存为绝对路径"""
+        from tts.sherpa_client import SherpaTTSClient
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(SherpaTTSClient, "_model_dir_cache", {})
+        (tmp_path / "models" / "vits-zh-aishell3" / "vits-zh-aishell3").mkdir(parents=True)
+        (tmp_path / "models" / "kokoro-multi-lang-v1_1-int8").mkdir()
+
+        client = make_sherpa_client()
+        nested = client._find_model_dir("vits-zh-aishell3")
+        assert Path(nested) == (tmp_path / "models/vits-zh-aishell3/vits-zh-aishell3").resolve()
+        fuzzy = client._find_model_dir("kokoro-multi-lang-v1_1")
+        assert Path(fuzzy) == (tmp_path / "models/kokoro-multi-lang-v1_1-int8").resolve()
+
+        # 命中缓存后不再访问文件系统
+        with patch("tts.sherpa_client._list_subdirs") as list_subdirs:
+            assert client._find_model_dir("vits-zh-aishell3") == nested
+        list_subdirs.assert_not_called()
+
+    def test_find_model_dir_after_chdir(self, tmp_path, monkeypatch, make_sherpa_client):
+        """测试切换工作目录后不返回旧目录下缓存的模型路径"""
+        from tts.sherpa_client import SherpaTTSClient
+
+        monkeypatch.setattr(SherpaTTSClient, "_model_dir_cache", {})
+        for name in ("a", "b"):
+            (tmp_path / name / "models" / "vits-zh-aishell3").mkdir(parents=True)
+
+        client = make_sherpa_client()
+        monkeypatch.chdir(tmp_path / "a")
+        first = client._find_model_dir("vits-zh-aishell3")
+        monkeypatch.chdir(tmp_path / "b")
+        second = client._find_model_dir("vits-zh-aishell3")
+        assert Path(first) == (tmp_path / "a/models/vits-zh-aishell3").resolve()
+        assert Path(second) == (tmp_path / "b/models/vits-zh-aishell3").resolve()
+
+    def test_find_model_dir_env_root(self, tmp_path, monkeypatch, make_sherpa_client):
+        """测试通过 VOICEIME_MODEL_PATH 指定额外的模型根目录"""
+        from tts.sherpa_client import MODEL_PATH_ENV, SherpaTTSClient
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(SherpaTTSClient, "_model_dir_cache", {})
+        root = tmp_path / "shared-models"
+        (root / "vits-zh-aishell3").mkdir(parents=True)
+
+        client = make_sherpa_client()
+        monkeypatch.delenv(MODEL_PATH_ENV, raising=False)
+        with pytest.raises(FileNotFoundError):
+            client._find_model_dir("vits-zh-aishell3")
+
+        monkeypatch.setenv(MODEL_PATH_ENV, str(root))
+        assert Path(client._find_model_dir("vits-zh-aishell3")) == (root / "vits-zh-aishell3").resolve()
+
+    def test_model_path_prefers_int8(self, tmp_path, make_sherpa_client):
+        """测试启用量化时优先 .int8.onnx，缺失时回退到 .onnx"""
+        quantized = make_sherpa_client(quantized=True)
+
+        fp32 = tmp_path / "vits-zh-aishell3.onnx"
+        assert quantized._model_path() == str(fp32)
+
+        int8 = tmp_path / "vits-zh-aishell3.int8.onnx"
+        int8.touch()
+        assert quantized._model_path() == str(int8)
+
+        assert make_sherpa_client(quantized=False)._model_path() == str(fp32)
+
+    def test_engine_reused_across_clients(self, make_sherpa_client):
+        """测试相同模型配置的引擎只加载一次，shutdown_all 后重新加载"""
+        pytest.importorskip("sherpa_onnx")
+        from tts.factory import TTSClientFactory
+
+        def load(**kwargs):
+            kwargs.setdefault("num_threads", 2)
+            client = make_sherpa_client(warmup=False, **kwargs)
+            return client._load_engine(key, config=None)
+
+        key = ("vits", "model.onnx", "tokens.txt", "lexicon.txt")
+        TTSClientFactory.shutdown_all()
+        with patch("sherpa_onnx.OfflineTts", side_effect=lambda config: object()) as offline_tts:
+            first = load()
+            assert load() is first
+            assert offline_tts.call_count == 1
+
+            assert load(reuse_engine=False) is not first
+            assert load(num_threads=4) is not first
+
+            TTSClientFactory.shutdown_all()
+            assert load() is not first
+            assert offline_tts.call_count == 4
+        TTSClientFactory.shutdown_all()
+
+    def test_engine_shared_across_path_spellings(self, tmp_path, monkeypatch, make_sherpa_client):
+        """测试相对路径与绝对路径指向同一模型文件时共享引擎"""
+        pytest.importorskip("sherpa_onnx")
+        from tts.factory import TTSClientFactory
+
+        client = make_sherpa_client(num_threads=2, warmup=False)
+
+        monkeypatch.chdir(tmp_path)
+        absolute = ("vits", str(tmp_path / "model.onnx"), str(tmp_path / "tokens.txt"), None)
+        relative = ("vits", "model.onnx", "./tokens.txt", None)
+
+        TTSClientFactory.shutdown_all()
+        with patch("sherpa_onnx.OfflineTts", side_effect=lambda config: object()) as offline_tts:
+            assert client._load_engine(relative, config=None) is client._load_engine(absolute, config=None)
+            assert offline_tts.call_count == 1
+        TTSClientFactory.shutdown_all()
+
+    def test_new_engine_warmup(self, make_sherpa_client):
+        """测试新建引擎后预热一次，预热失败不影响使用"""
+        pytest.importorskip("sherpa_onnx")
+
+        with patch("sherpa_onnx.OfflineTts") as offline_tts:
+            engine = offline_tts.return_value
+
+            client = make_sherpa_client(warmup=True)
+            assert client._new_engine(config=None) is engine
+            engine.generate.assert_called_once_with("。", sid=0, speed=1.0)
+
+            engine.generate.side_effect = RuntimeError("boom")
+            assert client._new_engine(config=None) is engine
+
+            engine.generate.reset_mock()
+            make_sherpa_client(warmup=False)._new_engine(config=None)
+            engine.generate.assert_not_called()
+
+    def test_generate_batch(self, make_sherpa_client):
+        """测试并发批量生成：结果顺序与输入一致"""
+        client = make_sherpa_client()
+
+        texts = ["一", "二二", "三三三", "四四四四"]
+        results = client.generate_batch(texts, speaker_id=3, max_workers=4)
+
+        assert [r.text for r in results] == texts
+        assert [len(r.audio) for r in results] == [1, 2, 3, 4]
+        assert all(r.speaker_id == 3 for r in results)
+        assert client._tts.generate.call_count == 4
+
+    def test_generate_int16(self, make_sherpa_client):
+        """测试 int16 输出：缩放、取整并限幅，缓存仍保存 float32"""
+        client = make_sherpa_client(cache_size=4)
+        client._tts.generate.side_effect = lambda text, sid, speed: Mock(samples=[0.5, -1.0, 2.0])
+
+        result = client.generate("你好", output_dtype="int16")
+        assert result.audio.dtype == np.int16
+        assert result.audio.tolist() == [16384, -32767, 32767]
+
+        assert client.generate("你好").audio.tolist() == [0.5, -1.0, 2.0]
+
+        with pytest.raises(ValueError):
+            client.generate("你好", output_dtype="int8")
+
+    def test_generate_streaming(self, make_sherpa_client):
+        """测试流式回调：逐段输出已增益的音频，返回 False 时停止"""
+        client = make_sherpa_client(cache_size=4, gain_mode="raw")
+
+        def fake_generate(text, sid, speed, callback=None):
+            produced = []
+            for chunk in ([0.01, 0.02], [0.2]):
+                produced.extend(chunk)
+                if callback(np.array(chunk, dtype=np.float32), len(produced) / 3) == 0:
+                    break
+            return Mock(samples=produced)
+
+        client._tts.generate.side_effect = fake_generate
+
+        chunks = []
+        result = client.generate("你好", volume_db=20.0, callback=lambda chunk, progress: chunks.append(chunk))
+        np.testing.assert_allclose(np.concatenate(chunks), [0.1, 0.2, 1.0], rtol=1e-6)
+        np.testing.assert_allclose(result.audio, [0.1, 0.2, 1.0], rtol=1e-6)
+        assert not client._cache
+
+        stopped = client.generate("你好", callback=lambda chunk, progress: False)
+        assert len(stopped.audio) == 2
+
+    @pytest.mark.parametrize("gain_mode", ["l2", "peak"])
+    def test_generate_streaming_caps_chunk_gain(self, make_sherpa_client, gain_mode):
+        """测试非 raw 模式：回调各段增益上限为 1.0（不削波），返回音频与非流式一致"""
+        from tts.sherpa_client import SherpaTTSClient
+
+        client = make_sherpa_client(volume_db=SherpaTTSClient.DEFAULT_VOLUME_DB, gain_mode=gain_mode)
+        sine = (0.4 * np.sin(np.linspace(0, 2 * np.pi * 660, 16000 * 3))).astype(np.float32)
+
+        def fake_generate(text, sid, speed, callback=None):
+            if callback is not None:
+                for chunk in np.array_split(sine, 3):
+                    callback(chunk, 0.0)
+            return Mock(samples=sine.copy())
+
+        client._tts.generate.side_effect = fake_generate
+
+        chunks = []
+        result = client.generate("你好", callback=lambda chunk, progress: chunks.append(chunk))
+        # 正 dB 不放大回调音频
+        np.testing.assert_allclose(np.concatenate(chunks), sine, rtol=1e-6)
+        np.testing.assert_allclose(result.audio, client.generate("你好").audio, rtol=1e-6)
+
+    def test_result_cache(self, make_sherpa_client):
+        """测试结果缓存：相同参数命中缓存，共享只读音频，超出容量按 LRU 淘汰"""
+        client = make_sherpa_client(cache_size=2)
+
+        first = client.generate("你好")
+        with pytest.raises(ValueError):
+            first.audio[:] = 0
+        again = client.generate("你好")
+        assert client._tts.generate.call_count == 1
+        assert np.shares_memory(again.audio, first.audio)
+
+        client.generate("你好", speaker_id=1)
+        client.generate("再见")
+        assert client._tts.generate.call_count == 3
+        client.generate("你好")
+        assert client._tts.generate.call_count == 4
+
+    async def test_generate_async_pool(self, make_sherpa_client):
+        """测试请求池：并发请求合并处理，结果各自返回"""
+        import asyncio
+
+        client = make_sherpa_client(enable_pool=True)
+        try:
+            texts = ["一", "二二", "三三三"]
+            results = await asyncio.gather(*(client.generate_async(t) for t in texts))
+            assert [r.text for r in results] == texts
+            assert [len(r.audio) for r in results] == [1, 2, 3]
+        finally:
+            client.close()
+        assert client._pool_thread is None
+
+    async def test_generate_async_without_pool(self, make_sherpa_client):
+        """测试未启用请求池时在线程池中执行 generate"""
+        client = make_sherpa_client()
+
+        result = await client.generate_async("你好", speaker_id=2)
+        assert result.text == "你好"
+        assert result.speaker_id == 2
 
     @pytest.mark.skip(reason="需要实际的模型文件")
     def test_init_with_valid_model(self):
         """测试使用有效模型初始化"""
+        pytest.importorskip("sherpa_onnx")
         from tts.sherpa_client import SherpaTTSClient
 
         client = SherpaTTSClient(
@@ -373,6 +628,7 @@ class TestSherpaTTSClient:
     @pytest.mark.skip(reason="需要实际的模型文件")
     def test_generate_audio(self):
         """测试生成音频"""
+        pytest.importorskip("sherpa_onnx")
         from tts.sherpa_client import SherpaTTSClient
 
         client = SherpaTTSClient(
@@ -396,6 +652,7 @@ class TestSherpaTTSClient:
     @pytest.mark.skip(reason="需要实际的模型文件")
     def test_volume_gain(self):
         """测试音量增益"""
+        pytest.importorskip("sherpa_onnx")
         from tts.sherpa_client import SherpaTTSClient
 
         # 创建一个 client
@@ -417,21 +674,11 @@ class TestSherpaTTSClient:
 
         client.close()
 
-    def test_repr(self):
+    def test_repr(self, make_sherpa_client):
         """测试 __repr__"""
-        from tts.sherpa_client import SherpaTTSClient
-
-        # 使用 mock 避免加载真实模型
-        with patch.object(SherpaTTSClient, '_init_engine'):
-            client = SherpaTTSClient.__new__(SherpaTTSClient)
-            client._model = "test-model"
-            client._tts = Mock()
-            client._tts.sample_rate = 16000
-            client._tts.num_speakers = 10
-
-            repr_str = repr(client)
-            assert "SherpaTTSClient" in repr_str
-            assert "test-model" in repr_str
+        repr_str = repr(make_sherpa_client())
+        assert "SherpaTTSClient" in repr_str
+        assert "vits-zh-aishell3" in repr_str
 
 
 class TestModuleExports:
@@ -467,6 +714,19 @@ class TestModuleExports:
         for name in expected:
             assert name in tts.__all__
 
+    def test_import_is_lazy(self):
+        """测试导入 tts 不会加载 sherpa_onnx / torch（在独立解释器中检查）"""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, tts; "
+            "assert 'sherpa_onnx' not in sys.modules; "
+            "assert 'torch' not in sys.modules"
+        )
+        root = Path(__file__).resolve().parents[1]
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,6 +4,7 @@
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 
@@ -162,16 +163,20 @@ def test_multiple_speakers():
 
     speaker_ids = [77, 99, 1, 6]
 
+    def run_one(sid):
+        # 推理在原生代码中释放 GIL，各说话人可并行生成（同一模型的引擎只加载一次）
+        with create_tts_client(
+            engine="sherpa-vits",
+            model="vits-zh-hf-fanchen-C",
+            speaker_id=sid,
+        ) as client:
+            return client.generate("切换说话人测试").duration
+
     try:
-        for sid in speaker_ids:
-            client = create_tts_client(
-                engine="sherpa-vits",
-                model="vits-zh-hf-fanchen-C",
-                speaker_id=sid,
-            )
-            result = client.generate("切换说话人测试")
-            print(f"  说话人 {sid}: {result.duration:.2f}秒")
-            client.close()
+        with ThreadPoolExecutor(max_workers=len(speaker_ids)) as executor:
+            durations = list(executor.map(run_one, speaker_ids))
+        for sid, duration in zip(speaker_ids, durations):
+            print(f"  说话人 {sid}: {duration:.2f}秒")
 
         print("\n[通过] 多说话人切换测试成功")
         return True
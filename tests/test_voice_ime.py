@@ -0,0 +1,159 @@
+"""voice_ime 录音、归一化与并发回退单元测试"""
+
+import sys
+import time
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from asr import ASRClient, ASRClientFactory
+
+# sounddevice 需要 PortAudio，keyboard 会安装全局钩子，导入时替换为桩模块
+with patch.dict(sys.modules, {"sounddevice": MagicMock(), "keyboard": MagicMock()}):
+    import voice_ime
+
+
+class ScriptedClient(ASRClient):
+    """按预设延迟返回文本或抛出异常的假引擎"""
+
+    def __init__(self, name, result, delay=0.0):
+        self._name = name
+        self.result = result
+        self.delay = delay
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def is_available(self):
+        return True
+
+    def _run(self):
+        time.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    def transcribe(self, audio_path: str) -> str:
+        return self._run()
+
+    def transcribe_audio_data(self, audio_data) -> str:
+        return self._run()
+
+
+@pytest.fixture
+def make_ime(monkeypatch, tmp_path):
+    """用假主引擎和假 MOSS 创建启用并发回退的 VoiceIME"""
+    monkeypatch.setattr(voice_ime.Path, "home", lambda: tmp_path)
+    imes = []
+
+    def factory(primary, backup):
+        engines = {"fake": lambda **kwargs: primary, "moss": lambda **kwargs: backup}
+        with patch.dict(ASRClientFactory._engines, engines):
+            ime = voice_ime.VoiceIME(
+                asr_engine="fake", auto_paste=False, cache_client=False,
+                race_fallback=True, api_key="key",
+            )
+        imes.append(ime)
+        return ime
+
+    yield factory
+    for ime in imes:
+        ime._race_executor.shutdown(wait=False)
+        ime._finish_cleanup()
+
+
+def _audio(frames=1600):
+    return np.zeros((frames, 1), dtype=np.int16)
+
+
+class TestTranscribeRace:
+    """测试主引擎与 MOSS 的并发识别"""
+
+    def test_first_success_wins(self, make_ime):
+        ime = make_ime(ScriptedClient("Local", "本地"), ScriptedClient("MOSS", "云端", delay=0.5))
+        start = time.monotonic()
+        assert ime._transcribe_race(_audio()) == ("本地", "Local")
+        assert time.monotonic() - start < 0.4
+
+    def test_failover_when_first_fails(self, make_ime):
+        ime = make_ime(
+            ScriptedClient("Local", RuntimeError("本地失败")),
+            ScriptedClient("MOSS", "云端", delay=0.05),
+        )
+        assert ime._transcribe_race(_audio()) == ("云端", "MOSS")
+
+    def test_last_error_raised_when_both_fail(self, make_ime):
+        ime = make_ime(
+            ScriptedClient("Local", RuntimeError("本地失败")),
+            ScriptedClient("MOSS", ValueError("云端失败"), delay=0.05),
+        )
+        with pytest.raises(ValueError, match="云端失败"):
+            ime._transcribe_race(_audio())
+
+    def test_next_round_does_not_wait_for_loser(self, make_ime):
+        ime = make_ime(ScriptedClient("Local", "本地"), ScriptedClient("MOSS", "云端", delay=1.0))
+        start = time.monotonic()
+        for _ in range(2):
+            assert ime._transcribe_race(_audio()) == ("本地", "Local")
+        assert time.monotonic() - start < 0.8
+
+
+class TestRecorder:
+    """测试录音缓冲区与 WAV 写出"""
+
+    def test_grow_keeps_recorded_frames(self):
+        recorder = voice_ime.Recorder(sample_rate=100, buffer_seconds=1)
+        blocks = [np.full((64, 1), i, dtype=np.int16) for i in range(3)]
+        for block in blocks:
+            recorder._write_block(block)
+        assert len(recorder._buffer) >= 192
+        np.testing.assert_array_equal(recorder._buffer[:recorder._write_pos], np.concatenate(blocks))
+
+    @pytest.mark.parametrize("channels", [1, 2])
+    def test_wav_header_round_trips(self, tmp_path, channels):
+        recorder = voice_ime.Recorder(channels=channels)
+        audio = np.random.default_rng(0).integers(-32768, 32767, (1000, channels), dtype=np.int16)
+        path = tmp_path / "rec.wav"
+        recorder.save_to_wav(audio, str(path))
+
+        with wave.open(str(path), "rb") as f:
+            assert f.getnchannels() == channels
+            assert f.getsampwidth() == 2
+            assert f.getframerate() == voice_ime.SAMPLE_RATE
+            assert f.getnframes() == 1000
+            assert f.readframes(1000) == audio.tobytes()
+
+
+class TestNormalize:
+    """测试 numba 内核与 NumPy 版本输出一致"""
+
+    @pytest.mark.parametrize("audio", [
+        np.random.default_rng(1).integers(-2000, 6000, 4000).astype(np.int16),
+        np.random.default_rng(2).integers(-32768, 32767, 4000).astype(np.int16),
+        np.full(100, 1234, dtype=np.int16),
+        np.zeros(0, dtype=np.int16),
+    ], ids=["dc-offset", "full-scale", "constant", "empty"])
+    def test_kernels_match(self, audio):
+        expected = audio.copy()
+        voice_ime._normalize_int16_numpy(expected, voice_ime.NORMALIZE_PEAK, voice_ime.NORMALIZE_MAX_GAIN)
+        # 未编译的 Python 版本与 numba 内核是同一份代码
+        loop = audio.copy()
+        voice_ime._normalize_int16_loop(loop, voice_ime.NORMALIZE_PEAK, voice_ime.NORMALIZE_MAX_GAIN)
+        np.testing.assert_array_equal(loop, expected)
+
+        if voice_ime.njit is not None:
+            jitted = audio.copy()
+            voice_ime._normalize_int16(jitted, voice_ime.NORMALIZE_PEAK, voice_ime.NORMALIZE_MAX_GAIN)
+            np.testing.assert_array_equal(jitted, expected)
+
+    def test_normalize_removes_dc_and_scales_peak(self):
+        audio = (np.sin(np.linspace(0, 20, 1600)) * 5000 + 500).astype(np.int16).reshape(-1, 1)
+        result = voice_ime.normalize_int16(audio)
+        assert result is audio
+        # 去直流后残余均值不超过一个量化步长乘以增益
+        assert abs(audio.mean()) < voice_ime.NORMALIZE_MAX_GAIN
+        assert voice_ime.NORMALIZE_PEAK * 0.99 < np.abs(audio).max() <= voice_ime.NORMALIZE_PEAK
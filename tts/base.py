@@ -2,16 +2,20 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from functools import cached_property
+from typing import List, Optional
 import numpy as np
 
 
-@dataclass
+@dataclass(frozen=True)
 class TTSResult:
     """TTS 生成结果
 
+    结果不可变：`audio` 保存传入数组的只读视图（不修改调用方数组的标志），
+    结果可在调用方之间安全共享而无需复制。
+
     Attributes:
-        audio: 音频数据 (float32, 范围 -1.0 ~ 1.0)
+        audio: 音频数据 (float32, 范围 -1.0 ~ 1.0；或 int16 PCM)
         sample_rate: 采样率 (Hz)
         duration: 音频时长（秒）
         text: 原始输入文本
@@ -23,6 +27,62 @@ class TTSResult:
     text: str
     speaker_id: Optional[int] = None
 
+    def __post_init__(self):
+        if isinstance(self.audio, np.ndarray):
+            view = self.audio.view()
+            view.setflags(write=False)
+            object.__setattr__(self, "audio", view)
+
+    def audio_view(self) -> np.ndarray:
+        """返回音频的只读视图（不复制数据）"""
+        view = self.audio.view()
+        view.setflags(write=False)
+        return view
+
+    @classmethod
+    def concat(cls, results: List["TTSResult"]) -> "TTSResult":
+        """将多段结果（如 generate_batch 的输出）拼接为一段
+
+        先汇总长度，再预分配一块连续缓冲区按切片写入，避免 np.concatenate
+        之前额外构建中间列表。
+
+        Args:
+            results: 采样率相同的 TTSResult 列表
+
+        Returns:
+            拼接后的 TTSResult；说话人不一致时 speaker_id 为 None
+
+        Raises:
+            ValueError: 列表为空或采样率不一致
+        """
+        if not results:
+            raise ValueError("No results to concatenate")
+        sample_rate = results[0].sample_rate
+        if any(r.sample_rate != sample_rate for r in results):
+            raise ValueError("Cannot concatenate results with different sample rates")
+
+        total = sum(len(r.audio) for r in results)
+        audio = np.empty(total, dtype=np.result_type(*(r.audio for r in results)))
+        offset = 0
+        for r in results:
+            end = offset + len(r.audio)
+            np.copyto(audio[offset:end], r.audio)
+            offset = end
+
+        speaker_ids = {r.speaker_id for r in results}
+        return cls(
+            audio=audio,
+            sample_rate=sample_rate,
+            duration=total / sample_rate,
+            text="".join(r.text for r in results),
+            speaker_id=speaker_ids.pop() if len(speaker_ids) == 1 else None,
+        )
+
+    @cached_property
+    def audio_bytes(self) -> bytes:
+        """音频原始字节（首次访问时序列化并缓存）"""
+        return self.audio.tobytes()
+
     def save(self, filepath: str):
         """保存音频到文件
 
@@ -30,9 +90,13 @@ class TTSResult:
             filepath: 输出文件路径
         """
         import sherpa_onnx
+        audio = self.audio
+        if audio.dtype == np.int16:
+            # write_wave 接受 -1.0 ~ 1.0 的浮点采样
+            audio = audio.astype(np.float32) / 32768.0
         sherpa_onnx.write_wave(
             filepath,
-            self.audio,
+            audio,
             self.sample_rate
         )
 
@@ -104,6 +168,33 @@ class TTSClient(ABC):
         """
         pass
 
+    def generate_batch(
+        self,
+        texts: List[str],
+        speaker_id: Optional[int] = None,
+        speed: float = 1.0,
+        volume_db: Optional[float] = None,
+        **kwargs
+    ) -> List[TTSResult]:
+        """批量生成语音
+
+        默认逐条调用 `generate`，引擎可覆盖以实现并行或批处理。
+
+        Args:
+            texts: 要转换的文本列表
+            speaker_id: 说话人 ID（如果支持多说话人）
+            speed: 语速 (0.5 - 2.0)，1.0 为正常速度
+            volume_db: 音量增益 (dB)，None 使用默认值
+            **kwargs: 额外参数
+
+        Returns:
+            与 texts 顺序一致的 TTSResult 列表
+        """
+        return [
+            self.generate(text, speaker_id=speaker_id, speed=speed, volume_db=volume_db, **kwargs)
+            for text in texts
+        ]
+
     @abstractmethod
     def is_available(self) -> bool:
         """检查引擎是否可用
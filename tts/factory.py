@@ -91,6 +91,14 @@ class TTSClientFactory:
         engine_class = cls._engines[engine_key]
         return engine_class(**kwargs)
 
+    @classmethod
+    def shutdown_all(cls):
+        """释放所有引擎实现缓存的模型（如 SherpaTTSClient 的共享引擎）"""
+        for engine_class in set(cls._engines.values()):
+            clear_cache = getattr(engine_class, "clear_engine_cache", None)
+            if clear_cache is not None:
+                clear_cache()
+
     @classmethod
     def available_engines(cls) -> list:
         """列出所有可用的引擎
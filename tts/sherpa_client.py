@@ -1,15 +1,74 @@
 """Sherpa-ONNX TTS 客户端实现"""
 
+import asyncio
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 import numpy as np
 
-import sherpa_onnx
-import torch
-
 from .base import TTSClient, TTSResult
 
+if TYPE_CHECKING:
+    # sherpa_onnx 在首次初始化引擎时才导入，`import tts` 不加载原生库
+    import sherpa_onnx
+
+
+# 额外的模型根目录（与服务配置 `model_path` 使用同一环境变量）
+MODEL_PATH_ENV = "VOICEIME_MODEL_PATH"
+
+
+@lru_cache(maxsize=1)
+def _cpu_has_vnni() -> bool:
+    """检测 CPU 是否支持 VNNI 指令（int8 点积加速）
+
+    不支持 VNNI 的 CPU 上 int8 模型可能反而更慢，因此仅在检测到时默认启用量化模型。
+    非 Linux 平台读取不到 /proc/cpuinfo，返回 False。
+    """
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = line.split(":", 1)[-1].split()
+                    return "avx512_vnni" in flags or "avx_vnni" in flags
+    except OSError:
+        pass
+    return False
+
+
+@lru_cache(maxsize=1)
+def _blas_snrm2():
+    """SciPy 提供的 BLAS snrm2（可选依赖，首次使用时导入；未安装返回 None）"""
+    try:
+        from scipy.linalg.blas import snrm2
+    except ImportError:
+        return None
+    return snrm2
+
+
+def _list_subdirs(root: Path) -> List[str]:
+    """列出目录下的子目录名（一次 scandir，目录不存在时返回空列表）"""
+    try:
+        with os.scandir(root) as it:
+            return [entry.name for entry in it if entry.is_dir()]
+    except OSError:
+        return []
+
+
+def _resolve_future(future: "asyncio.Future", result, error: Optional[BaseException]):
+    """在事件循环线程中设置 Future 结果（调用方已取消时忽略）"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
 
 class SherpaTTSClient(TTSClient):
     """Sherpa-ONNX TTS 客户端
@@ -25,12 +84,25 @@ class SherpaTTSClient(TTSClient):
     """
 
     DEFAULT_VOLUME_DB = 25.0
+    DEFAULT_CACHE_SIZE = 32
+    GAIN_MODES = ("peak", "raw", "l2")
     SUPPORTED_MODELS = [
         "vits-zh-hf-fanchen-C",
         "kokoro-multi-lang-v1_1",
         "vits-zh-aishell3",
     ]
 
+    # 请求池：每批最多合并的请求数，以及收集同一批请求的时间窗口（秒）
+    POOL_MAX_BATCH = 8
+    POOL_WINDOW = 0.005
+
+    # (模型名, 各搜索根目录的绝对路径) -> 已解析的模型目录（绝对路径）
+    _model_dir_cache: Dict[Tuple[str, ...], str] = {}
+
+    # 已加载的引擎，按模型文件配置共享（加载 ONNX 权重、建立会话耗时数秒）
+    _engine_cache: Dict[Tuple[str, ...], "sherpa_onnx.OfflineTts"] = {}
+    _engine_cache_lock = threading.Lock()
+
     def __init__(
         self,
         model: str = "vits-zh-hf-fanchen-C",
@@ -38,6 +110,14 @@ class SherpaTTSClient(TTSClient):
         volume_db: float = DEFAULT_VOLUME_DB,
         model_dir: Optional[str] = None,
         data_dir: Optional[str] = None,
+        quantized: Optional[bool] = None,
+        reuse_engine: bool = True,
+        enable_pool: bool = False,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        num_threads: Optional[int] = None,
+        provider: str = "cpu",
+        gain_mode: str = "l2",
+        warmup: bool = True,
     ):
         """初始化 Sherpa TTS 客户端
 
@@ -47,6 +127,18 @@ class SherpaTTSClient(TTSClient):
             volume_db: 音量增益 (dB)，0 表示不调整
             model_dir: 模型目录，默认从 models/ 目录自动查找
             data_dir: 数据目录（Kokoro 需要 espeak-ng-data）
+            quantized: 是否优先使用 `.int8.onnx` 量化模型（不存在时回退到 `.onnx`），
+                None 表示仅在 CPU 支持 VNNI 时启用
+            reuse_engine: 是否复用相同模型配置已加载的引擎
+            enable_pool: 是否启动请求池，供 `generate_async` 合并并发请求
+            cache_size: 生成结果 LRU 缓存的条目数，0 表示不缓存
+            num_threads: ONNX Runtime 推理线程数，默认 CPU 核数的一半
+                （多个客户端并存时避免线程争抢）
+            provider: ONNX Runtime 执行后端，如 "cpu"、"cuda"、"coreml"
+            gain_mode: 音量增益模式，"l2"（默认，L2 归一化后乘以振幅倍数）、
+                "peak"（峰值归一化，DEFAULT_VOLUME_DB 对应满幅，不削波）
+                或 "raw"（直接放大并限幅）；volume_db 为 0 时均不调整
+            warmup: 新建引擎后是否先合成一次短文本预热
 
         Raises:
             FileNotFoundError: 模型文件不存在
@@ -54,19 +146,46 @@ class SherpaTTSClient(TTSClient):
         """
         self._model = model
         self._default_speaker_id = speaker_id
+        if gain_mode not in self.GAIN_MODES:
+            raise ValueError(f"Unsupported gain_mode: {gain_mode}. Supported: {self.GAIN_MODES}")
         self._volume_db = volume_db
+        self._gain_mode = gain_mode
+        # 默认音量对应的振幅倍数，避免每次生成都重新计算 pow
+        self._gain_scalar = self._db_to_gain(volume_db)
         self._model_dir = model_dir or self._find_model_dir(model)
         self._data_dir = data_dir
+        self._quantized = _cpu_has_vnni() if quantized is None else quantized
+        self._reuse_engine = reuse_engine
+        self._num_threads = num_threads or max(1, (os.cpu_count() or 2) // 2)
+        self._provider = provider
+        self._warmup = warmup
 
         # Sherpa-ONNX 引擎实例
-        self._tts: Optional[sherpa_onnx.OfflineTts] = None
+        self._tts: Optional["sherpa_onnx.OfflineTts"] = None
+
+        # 生成结果 LRU 缓存：(text, sid, speed, db) -> 只读音频
+        # OfflineTts 的 Python 接口不暴露文本前端（音素化），无法单独缓存音素序列，
+        # 重复文本统一由结果缓存跳过整个推理
+        self._cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # 请求池（见 generate_async）
+        self._pool_queue: Optional[queue.SimpleQueue] = None
+        self._pool_thread: Optional[threading.Thread] = None
 
         # 初始化引擎
         self._init_engine()
 
+        if enable_pool:
+            self._start_pool()
+
     def _find_model_dir(self, model: str) -> str:
         """查找模型目录
 
+        结果按模型名和搜索根目录缓存在类上（保存绝对路径），切换工作目录或
+        VOICEIME_MODEL_PATH 后重新查找；命中时仅确认目录仍然存在。
+
         Args:
             model: 模型名称
 
@@ -76,37 +195,47 @@ class SherpaTTSClient(TTSClient):
         Raises:
             FileNotFoundError: 模型目录不存在
         """
-        # 在多个可能的位置查找
-        search_paths = [
-            Path("models") / model,
-            Path("/home/hailay/ExoMind-Obsidian-HailayLin/1-Projects/exomind-model/models") / model,
-            Path(f"models/{model}"),
-        ]
-
-        for base_path in search_paths:
-            if base_path.exists() and base_path.is_dir():
-                # 检查是否有嵌套的同名子目录
-                nested = base_path / model
-                if nested.exists() and nested.is_dir():
-                    return str(nested)
-                # 直接返回基目录
-                return str(base_path)
-
-        # 模糊匹配
-        models_base = Path("models")
-        if models_base.exists():
-            for entry in models_base.iterdir():
-                if entry.is_dir() and model.lower() in entry.name.lower():
-                    # 检查是否有嵌套的同名子目录
-                    nested = entry / model
-                    if nested.exists() and nested.is_dir():
-                        return str(nested)
-                    return str(entry)
-
-        raise FileNotFoundError(
-            f"Model not found: {model}. "
-            f"Searched in: {[str(p) for p in search_paths]}"
-        )
+        # 在多个可能的位置查找，每个根目录只读取一次
+        search_roots = [Path("models")]
+        env_root = os.environ.get(MODEL_PATH_ENV)
+        if env_root:
+            search_roots.append(Path(env_root))
+
+        cache_key = (model, *(os.path.realpath(root) for root in search_roots))
+        cached = self._model_dir_cache.get(cache_key)
+        if cached is not None and os.path.isdir(cached):
+            return cached
+
+        subdirs = {root: _list_subdirs(root) for root in search_roots}
+
+        model_dir = None
+        for root in search_roots:
+            if model in subdirs[root]:
+                model_dir = self._resolve_nested(root / model, model)
+                break
+        else:
+            # 模糊匹配
+            models_base = search_roots[0]
+            for name in subdirs[models_base]:
+                if model.lower() in name.lower():
+                    model_dir = self._resolve_nested(models_base / name, model)
+                    break
+
+        if model_dir is None:
+            raise FileNotFoundError(
+                f"Model not found: {model}. "
+                f"Searched in: {[str(root / model) for root in search_roots]}"
+            )
+
+        model_dir = os.path.realpath(model_dir)
+        self._model_dir_cache[cache_key] = model_dir
+        return model_dir
+
+    @staticmethod
+    def _resolve_nested(base_path: Path, model: str) -> str:
+        """有嵌套的同名子目录时返回子目录，否则返回基目录"""
+        nested = base_path / model
+        return str(nested) if nested.is_dir() else str(base_path)
 
     def _init_engine(self):
         """初始化 TTS 引擎"""
@@ -122,9 +251,19 @@ class SherpaTTSClient(TTSClient):
                 f"Supported: {self.SUPPORTED_MODELS}"
             )
 
+    def _model_path(self) -> str:
+        """模型文件路径（启用量化时优先 `.int8.onnx`）"""
+        if self._quantized:
+            int8_path = os.path.join(self._model_dir, f"{self._model}.int8.onnx")
+            if os.path.exists(int8_path):
+                return int8_path
+        return os.path.join(self._model_dir, f"{self._model}.onnx")
+
     def _init_vits(self):
         """初始化 VITS 引擎"""
-        model_path = os.path.join(self._model_dir, f"{self._model}.onnx")
+        import sherpa_onnx
+
+        model_path = self._model_path()
         tokens_path = os.path.join(self._model_dir, "tokens.txt")
         lexicon_path = os.path.join(self._model_dir, "lexicon.txt")
 
@@ -139,13 +278,17 @@ class SherpaTTSClient(TTSClient):
                 tokens=tokens_path,
                 lexicon=lexicon_path,
             ),
+            num_threads=self._num_threads,
+            provider=self._provider,
         )
         config = sherpa_onnx.OfflineTtsConfig(model=model_config)
-        self._tts = sherpa_onnx.OfflineTts(config)
+        self._tts = self._load_engine(("vits", model_path, tokens_path, lexicon_path), config)
 
     def _init_kokoro(self):
         """初始化 Kokoro 引擎"""
-        model_path = os.path.join(self._model_dir, f"{self._model}.onnx")
+        import sherpa_onnx
+
+        model_path = self._model_path()
         tokens_path = os.path.join(self._model_dir, "tokens.txt")
 
         # Kokoro 需要 espeak-ng-data 目录
@@ -154,7 +297,6 @@ class SherpaTTSClient(TTSClient):
             possible_data_dirs = [
                 Path(self._model_dir) / "espeak-ng-data",
                 Path("/usr/share/espeak-ng-data"),
-                Path("/home/hailay/ExoMind-Obsidian-HailayLin/1-Projects/exomind-model/models/kokoro-multi-lang-v1_1/espeak-ng-data"),
             ]
             for d in possible_data_dirs:
                 if d.exists():
@@ -173,9 +315,59 @@ class SherpaTTSClient(TTSClient):
                 tokens=tokens_path,
                 data_dir=self._data_dir,
             ),
+            num_threads=self._num_threads,
+            provider=self._provider,
         )
         config = sherpa_onnx.OfflineTtsConfig(model=model_config)
-        self._tts = sherpa_onnx.OfflineTts(config)
+        self._tts = self._load_engine(("kokoro", model_path, tokens_path, self._data_dir), config)
+
+    def _load_engine(self, key: Tuple[str, ...], config) -> "sherpa_onnx.OfflineTts":
+        """创建引擎，启用复用时优先取缓存
+
+        Args:
+            key: (模型类型, 模型文件路径...)，决定引擎是否可共享
+            config: Sherpa-ONNX 引擎配置
+
+        Returns:
+            OfflineTts 实例
+        """
+        if not self._reuse_engine:
+            return self._new_engine(config)
+
+        # 路径取规范形式，相对路径、绝对路径、符号链接指向同一模型文件时共享同一会话；
+        # 线程数和执行后端不同的会话不能共享
+        kind, *paths = key
+        key = (kind, *(os.path.realpath(p) if p else p for p in paths),
+               str(self._num_threads), self._provider)
+        cls = type(self)
+        with cls._engine_cache_lock:
+            engine = cls._engine_cache.get(key)
+            if engine is None:
+                engine = self._new_engine(config)
+                cls._engine_cache[key] = engine
+        return engine
+
+    def _new_engine(self, config) -> "sherpa_onnx.OfflineTts":
+        """创建引擎；启用预热时先合成一次短文本
+
+        首次推理要承担 ONNX Runtime 的内核选择和内存池分配，预热把这部分开销
+        移到初始化阶段。预热失败不影响引擎使用。
+        """
+        import sherpa_onnx
+
+        engine = sherpa_onnx.OfflineTts(config)
+        if self._warmup:
+            try:
+                engine.generate("。", sid=0, speed=1.0)
+            except Exception:
+                pass
+        return engine
+
+    @classmethod
+    def clear_engine_cache(cls):
+        """释放所有缓存的引擎（已持有引擎的客户端不受影响）"""
+        with cls._engine_cache_lock:
+            cls._engine_cache.clear()
 
     @property
     def name(self) -> str:
@@ -195,6 +387,8 @@ class SherpaTTSClient(TTSClient):
         speaker_id: Optional[int] = None,
         speed: float = 1.0,
         volume_db: Optional[float] = None,
+        output_dtype: str = "float32",
+        callback: Optional[Callable[[np.ndarray, float], Optional[bool]]] = None,
         **kwargs
     ) -> TTSResult:
         """生成语音
@@ -204,6 +398,12 @@ class SherpaTTSClient(TTSClient):
             speaker_id: 说话人 ID
             speed: 语速 (0.5 - 2.0)
             volume_db: 音量增益 (dB)，覆盖默认设置
+            output_dtype: 输出格式，"float32"（-1.0 ~ 1.0）或 "int16"（PCM）
+            callback: 流式回调 `callback(chunk, progress)`，每生成一段音频调用一次，
+                chunk 为已应用增益的 float32 副本，返回 False 时提前停止生成。
+                归一化需要完整音频，回调各段改按固定倍数逐段增益：非 "raw" 模式
+                倍数上限为 1.0（正 dB 不放大回调音频）。返回的完整音频与不带回调时
+                一致；流式模式不使用结果缓存
             **kwargs: 额外参数
 
         Returns:
@@ -211,26 +411,29 @@ class SherpaTTSClient(TTSClient):
 
         Raises:
             RuntimeError: 引擎未初始化
-            ValueError: 无效的说话人 ID
+            ValueError: 无效的说话人 ID 或输出格式
         """
         if not self._tts:
             raise RuntimeError("TTS engine not initialized")
+        if output_dtype not in ("float32", "int16"):
+            raise ValueError(f"Unsupported output_dtype: {output_dtype}")
 
         # 确定说话人 ID
         sid = speaker_id if speaker_id is not None else self._default_speaker_id
 
         # 确定音量增益
-        db = volume_db if volume_db is not None else self._volume_db
-
-        # 生成音频
-        audio = self._tts.generate(text, sid=sid, speed=speed)
+        if volume_db is None:
+            db, gain = self._volume_db, self._gain_scalar
+        else:
+            db, gain = volume_db, self._db_to_gain(volume_db)
 
-        # 转换为 numpy 数组
-        audio_data = np.array(audio.samples, dtype=np.float32)
+        if callback is not None:
+            audio_data = self._generate_streaming(text, sid, speed, db, gain, callback)
+        else:
+            audio_data = self._generate_cached(text, sid, speed, db, gain)
 
-        # 应用音量增益
-        if db != 0:
-            audio_data = self._apply_volume_gain(audio_data, db)
+        if output_dtype == "int16":
+            audio_data = self._to_pcm16(audio_data)
 
         duration = len(audio_data) / self.sample_rate
 
@@ -242,34 +445,283 @@ class SherpaTTSClient(TTSClient):
             speaker_id=sid,
         )
 
-    def _apply_volume_gain(self, audio_data: np.ndarray, db: float) -> np.ndarray:
-        """应用音量增益
+    def _generate_cached(self, text: str, sid: int, speed: float, db: float, gain: float) -> np.ndarray:
+        """一次性生成完整音频（优先取结果缓存）"""
+        cache_key = (text, sid, speed, db)
+        audio_data = self._cache_get(cache_key)
+        if audio_data is None:
+            # 生成音频
+            audio = self._tts.generate(text, sid=sid, speed=speed)
+
+            # 转换为 numpy 数组
+            audio_data = self._samples_to_array(audio.samples)
+
+            # 应用音量增益
+            if db != 0:
+                audio_data = self._apply_volume_gain(audio_data, gain, self._gain_mode)
+
+            self._cache_put(cache_key, audio_data)
+        return audio_data
+
+    def _generate_streaming(
+        self,
+        text: str,
+        sid: int,
+        speed: float,
+        db: float,
+        gain: float,
+        callback: Callable[[np.ndarray, float], Optional[bool]],
+    ) -> np.ndarray:
+        """边生成边通过回调输出音频段
+
+        归一化需要完整音频，逐段输出时改用固定倍数增益：仅 "raw" 模式按 dB
+        放大（会限幅），其他模式倍数不超过 1.0，不会削波。返回的完整音频
+        按 gain_mode 处理，与不带回调的 `generate` 结果一致。
+        """
+        chunk_gain = gain if self._gain_mode == "raw" else min(1.0, gain)
+
+        def on_samples(samples, progress: float) -> int:
+            # 采样缓冲区只在回调期间有效，必须复制
+            chunk = np.array(samples, dtype=np.float32)
+            if db != 0:
+                self._apply_volume_gain(chunk, chunk_gain, "raw")
+            # Sherpa-ONNX 约定：返回 0 停止生成，非 0 继续
+            return 0 if callback(chunk, progress) is False else 1
+
+        audio = self._tts.generate(text, sid=sid, speed=speed, callback=on_samples)
+        audio_data = self._samples_to_array(audio.samples)
+        if db != 0:
+            audio_data = self._apply_volume_gain(audio_data, gain, self._gain_mode)
+        return audio_data
+
+    def _cache_get(self, key: tuple) -> Optional[np.ndarray]:
+        """查询结果缓存，命中时返回缓存的只读音频（TTSResult 本身只读，无需复制）"""
+        if not self._cache_size:
+            return None
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: tuple, audio_data: np.ndarray):
+        """写入结果缓存（数组设为只读后直接共享），超出容量时淘汰最久未用的条目"""
+        if not self._cache_size:
+            return
+        audio_data.setflags(write=False)
+        with self._cache_lock:
+            self._cache[key] = audio_data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def generate_batch(
+        self,
+        texts: List[str],
+        speaker_id: Optional[int] = None,
+        speed: float = 1.0,
+        volume_db: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ) -> List[TTSResult]:
+        """批量生成语音
+
+        Sherpa-ONNX 的 Python 接口不提供批量推理，这里用线程池并发调用
+        `generate`：推理在原生代码中执行并释放 GIL，多条文本可真正并行。
+
+        Args:
+            texts: 输入文本列表
+            speaker_id: 说话人 ID
+            speed: 语速 (0.5 - 2.0)
+            volume_db: 音量增益 (dB)，覆盖默认设置
+            max_workers: 并发线程数，默认 CPU 核数的一半
+            **kwargs: 额外参数
+
+        Returns:
+            与 texts 顺序一致的 TTSResult 列表
+        """
+        def run(text: str) -> TTSResult:
+            return self.generate(text, speaker_id=speaker_id, speed=speed, volume_db=volume_db, **kwargs)
+
+        if len(texts) <= 1:
+            return [run(text) for text in texts]
+
+        workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        with ThreadPoolExecutor(max_workers=min(workers, len(texts))) as executor:
+            return list(executor.map(run, texts))
+
+    async def generate_async(
+        self,
+        text: str,
+        speaker_id: Optional[int] = None,
+        speed: float = 1.0,
+        volume_db: Optional[float] = None,
+    ) -> TTSResult:
+        """异步生成语音
+
+        启用请求池时，请求进入队列，由后台线程在短时间窗口内合并为一批
+        调用 `generate_batch`；未启用时在默认线程池中执行 `generate`。
+
+        Args:
+            text: 输入文本
+            speaker_id: 说话人 ID
+            speed: 语速 (0.5 - 2.0)
+            volume_db: 音量增益 (dB)，覆盖默认设置
+
+        Returns:
+            TTSResult: 生成结果
+        """
+        loop = asyncio.get_running_loop()
+        if self._pool_queue is None:
+            return await loop.run_in_executor(
+                None, lambda: self.generate(text, speaker_id=speaker_id, speed=speed, volume_db=volume_db)
+            )
+
+        future = loop.create_future()
+        self._pool_queue.put((text, (speaker_id, speed, volume_db), future, loop))
+        return await future
+
+    def _start_pool(self):
+        """启动请求池后台线程"""
+        self._pool_queue = queue.SimpleQueue()
+        self._pool_thread = threading.Thread(
+            target=self._pool_loop, name="sherpa-tts-pool", daemon=True
+        )
+        self._pool_thread.start()
+
+    def _stop_pool(self):
+        """停止请求池，已入队的请求会先处理完"""
+        if self._pool_thread is not None:
+            self._pool_queue.put(None)
+            self._pool_thread.join()
+            self._pool_thread = None
+            self._pool_queue = None
+
+    def _pool_loop(self):
+        """请求池线程：收集一个时间窗口内的请求，按参数分组批量生成"""
+        pool_queue = self._pool_queue
+        stopping = False
+        while not stopping:
+            item = pool_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.POOL_WINDOW
+            while len(batch) < self.POOL_MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = pool_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # generate_batch 只接受一组参数，相同参数的请求合并为一次调用
+            groups: Dict[tuple, list] = {}
+            for item in batch:
+                groups.setdefault(item[1], []).append(item)
+            for (speaker_id, speed, volume_db), items in groups.items():
+                try:
+                    results = self.generate_batch(
+                        [text for text, _, _, _ in items],
+                        speaker_id=speaker_id, speed=speed, volume_db=volume_db,
+                    )
+                except Exception as e:
+                    for _, _, future, loop in items:
+                        loop.call_soon_threadsafe(_resolve_future, future, None, e)
+                    continue
+                for (_, _, future, loop), result in zip(items, results):
+                    loop.call_soon_threadsafe(_resolve_future, future, result, None)
+
+    @staticmethod
+    def _samples_to_array(samples) -> np.ndarray:
+        """将引擎输出的采样转换为 float32 数组
+
+        已是 ndarray（或支持缓冲区协议）时零拷贝；Python 列表用 fromiter
+        直接写入 float32 缓冲区，省去 np.array 的中间转换。
+        """
+        if isinstance(samples, list):
+            return np.fromiter(samples, dtype=np.float32, count=len(samples))
+        return np.asarray(samples, dtype=np.float32)
+
+    @staticmethod
+    def _to_pcm16(audio_data: np.ndarray) -> np.ndarray:
+        """float32 转换为 int16 PCM
 
-        使用归一化和指数增益实现 +25dB 放大。
+        缩放、取整、限幅都在同一缓冲区上完成：原数组可写时原地处理，
+        只读（如已缓存）时缩放一步分配新缓冲区。
 
         Args:
-            audio_data: 原始音频数据
-            db: 增益分贝数
+            audio_data: float32 音频（可写时会被原地修改）
 
         Returns:
-            增益后的音频数据
+            int16 音频
         """
-        audio_tensor = torch.from_numpy(audio_data)
+        out = audio_data if audio_data.flags.writeable else None
+        scaled = np.multiply(audio_data, 32767.0, out=out)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        return scaled.astype(np.int16)
+
+    @staticmethod
+    def _db_to_gain(db: float) -> float:
+        """分贝转换为振幅倍数：10^(db/20)"""
+        return 10.0 ** (db / 20.0)
+
+    @classmethod
+    def _apply_volume_gain(cls, audio_data: np.ndarray, gain: float, mode: str = "l2") -> np.ndarray:
+        """应用音量增益（原地修改）
+
+        - l2: L2 归一化后乘以振幅倍数（默认，输出幅度随音频长度变化）
+        - peak: 按峰值归一化，以 DEFAULT_VOLUME_DB 为满幅参考：该值对应峰值 1.0，
+          每低 1 dB 峰值降低 1 dB；更高的值限制在 1.0，不削波
+        - raw: 直接乘以振幅倍数并限幅到 [-1, 1]
 
-        # 归一化 + 增益
-        # 10^(db/20) = 增益倍数（电压/振幅）
-        gain_factor = 10 ** (db / 20)
-        audio_gain = torch.nn.functional.normalize(
-            audio_tensor, p=2, dim=0
-        ) * gain_factor
+        Args:
+            audio_data: 原始音频数据（float32，会被原地修改）
+            gain: 振幅倍数，见 `_db_to_gain`
+            mode: 增益模式，见 `GAIN_MODES`
 
-        return audio_gain.numpy()
+        Returns:
+            增益后的音频数据
+        """
+        if mode == "raw":
+            np.multiply(audio_data, gain, out=audio_data)
+            np.clip(audio_data, -1.0, 1.0, out=audio_data)
+            return audio_data
+
+        if mode == "peak":
+            # 两次归约求绝对值最大值，不分配 np.abs 的临时数组
+            norm = max(float(audio_data.max()), -float(audio_data.min())) if audio_data.size else 0.0
+            gain = min(1.0, gain / cls._db_to_gain(cls.DEFAULT_VOLUME_DB))
+        else:
+            snrm2 = _blas_snrm2()
+            if snrm2 is not None and audio_data.dtype == np.float32:
+                # 直接调用 BLAS SNRM2（带溢出保护的缩放求和）
+                norm = float(snrm2(audio_data))
+            else:
+                norm = float(np.linalg.norm(audio_data))
+        # 全零（静音）音频保持不变
+        if norm > 0:
+            np.multiply(audio_data, gain / norm, out=audio_data)
+        return audio_data
 
     def is_available(self) -> bool:
         return self._tts is not None
 
     def close(self):
-        """释放资源"""
+        """释放资源
+
+        只解除本客户端对引擎的引用；缓存的引擎由 `clear_engine_cache` 释放。
+        """
+        self._stop_pool()
+        with self._cache_lock:
+            self._cache.clear()
         if self._tts is not None:
             # Sherpa-ONNX 不需要显式释放
             self._tts = None
@@ -28,11 +28,17 @@ VoiceIME 语音输入工具
 
 from typing import Optional
 import argparse
+import ctypes
+import logging
 import os
+import queue
+import re
+import struct
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from datetime import datetime
 
 # 加载 .env 环境变量
 from dotenv import load_dotenv
@@ -43,9 +49,22 @@ import sounddevice as sd
 import numpy as np
 import pyperclip  # 剪贴板操作
 
+try:
+    from numba import njit
+except ImportError:  # numba 为可选加速依赖
+    njit = None
+
+Quartz = None
+if sys.platform == 'darwin':
+    try:
+        import Quartz  # macOS 原生粘贴（pyobjc）
+    except ImportError:
+        pass
+
 # 导入 ASR 引擎模块
-from asr import ASRClientFactory, AudioContext, Scenario
+from asr import ASRClientFactory, AudioContext, MossClient, Scenario
 
+log = logging.getLogger('voice_ime')
 
 # ==================== 配置 ====================
 DEFAULT_HOTKEY = 'f2'  # 默认快捷键
@@ -54,72 +73,237 @@ DEFAULT_HOTKEY = 'f2'  # 默认快捷键
 SAMPLE_RATE = 16000  # 16kHz 采样率
 CHANNELS = 1         # 单声道
 DTYPE = 'int16'      # 16位深度
+# 每次读取的帧数：256 帧 = 16ms，停止录音时最多多等一个块；
+# 块越小停止越灵敏，但读取线程唤醒越频繁
+BLOCK_SIZE = 256
+RECORD_BUFFER_SECONDS = 60  # 录音缓冲区初始容量（秒），超出时自动扩容
+COMMAND_BUFFER_SECONDS = 10  # command 场景（短指令）的缓冲区初始容量（秒）
+
+# 提示音配置
+BEEP_SAMPLE_RATE = 44100  # 提示音采样率
+BEEP_DURATION = 0.15      # 提示音时长（秒）
+
+# 终端输出分隔线
+_SEP = '=' * 60
+_DASH = '-' * 60
+
+# SenseVoice 特殊标记，如 <|zh|><|NEUTRAL|>
+_TAG_RE = re.compile(r'<\|[^|]+\|>')
+# str.translate 删除表：去除 ASCII 空格
+_DROP_SPACES = str.maketrans('', '', ' ')
+
+# 音频归一化配置
+NORMALIZE_PEAK = 30000    # 去直流后峰值缩放到的目标幅度
+NORMALIZE_MAX_GAIN = 10.0  # 最大放大倍数，避免把静音底噪放大成满幅
+
+
+def _clean_text(text: str) -> str:
+    """清理识别文本：去除 SenseVoice 标记、字间空格和首尾空白
+
+    无 `<|` 时跳过正则（非 SenseVoice 模型），空格用 str.translate 一次删除。
+    """
+    if '<|' in text:
+        text = _TAG_RE.sub('', text)
+    return text.translate(_DROP_SPACES).strip()
+
+
+def _normalize_int16_loop(audio, target, max_gain):
+    """单遍统计均值和峰值，再原地去直流并缩放（numba 内核）"""
+    n = audio.shape[0]
+    if n == 0:
+        return
+    total = 0
+    lo = int(audio[0])
+    hi = lo
+    for i in range(n):
+        x = int(audio[i])
+        total += x
+        if x < lo:
+            lo = x
+        if x > hi:
+            hi = x
+    mean = total // n
+    peak = max(hi - mean, mean - lo, 1)
+    scale = min(target / peak, max_gain)
+    for i in range(n):
+        audio[i] = int((int(audio[i]) - mean) * scale)
+
+
+def _normalize_int16_numpy(audio, target, max_gain):
+    """NumPy 版本（未安装 numba 时使用），结果与内核一致"""
+    if audio.size == 0:
+        return
+    mean = int(audio.sum(dtype=np.int64)) // audio.size
+    peak = max(int(audio.max()) - mean, mean - int(audio.min()), 1)
+    scale = min(target / peak, max_gain)
+    scaled = audio.astype(np.float64)
+    scaled -= mean
+    scaled *= scale
+    np.copyto(audio, scaled, casting='unsafe')
+
+
+if njit is not None:
+    _normalize_int16 = njit(cache=True, fastmath=True)(_normalize_int16_loop)
+else:
+    _normalize_int16 = _normalize_int16_numpy
+
+
+def normalize_int16(audio: np.ndarray) -> np.ndarray:
+    """原地去除直流偏移并将峰值归一化到 NORMALIZE_PEAK
+
+    Args:
+        audio: int16 PCM 数组（单声道，需为连续内存）
+
+    Returns:
+        同一个数组（已原地修改）
+    """
+    _normalize_int16(audio.reshape(-1), NORMALIZE_PEAK, NORMALIZE_MAX_GAIN)
+    return audio
+
+
+def _native_paste() -> bool:
+    """用系统原生接口直接发送粘贴快捷键
+
+    Windows 通过 user32 注入 Ctrl+V，macOS 通过 Quartz 发送 Cmd+V。
+
+    Returns:
+        是否已发送（其他平台或缺少 Quartz 时返回 False，由调用方回退到 pyautogui）
+    """
+    if sys.platform == 'win32':
+        user32 = ctypes.windll.user32
+        VK_CONTROL, VK_V, KEYEVENTF_KEYUP = 0x11, 0x56, 0x0002
+        user32.keybd_event(VK_CONTROL, 0, 0, 0)
+        user32.keybd_event(VK_V, 0, 0, 0)
+        user32.keybd_event(VK_V, 0, KEYEVENTF_KEYUP, 0)
+        user32.keybd_event(VK_CONTROL, 0, KEYEVENTF_KEYUP, 0)
+        return True
+    if sys.platform == 'darwin':
+        if Quartz is None:
+            return False
+        kVK_ANSI_V = 9
+        for key_down in (True, False):
+            event = Quartz.CGEventCreateKeyboardEvent(None, kVK_ANSI_V, key_down)
+            Quartz.CGEventSetFlags(event, Quartz.kCGEventFlagMaskCommand)
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        return True
+    return False
 
 
 # ==================== 录音模块 ====================
 class Recorder:
-    """录音管理器"""
+    """录音管理器
+
+    由专用线程阻塞读取 RawInputStream（等待在 C 层，不占 GIL），
+    PortAudio 实时线程上不运行 Python 代码，GIL 竞争不会导致丢帧。
+    """
 
-    def __init__(self, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=CHANNELS,
+                 buffer_seconds=RECORD_BUFFER_SECONDS, blocksize=BLOCK_SIZE):
         self.sample_rate = sample_rate
         self.channels = channels
-        self.audio_data = []
+        self.blocksize = blocksize
+        # 预分配录音缓冲区，读取线程按写指针直接写入，避免逐块 copy 和结束时 concatenate
+        self._buffer = np.empty((sample_rate * buffer_seconds, channels), dtype=DTYPE)
+        self._write_pos = 0
         self.is_recording = False
         self.stream = None
+        self._reader = None
+        # 44 字节 WAV 头模板（16 位 PCM），保存时只需填写 RIFF/data 两个长度字段
+        block_align = channels * 2
+        self._wav_header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 0, b'WAVE', b'fmt ', 16, 1, channels, sample_rate,
+            sample_rate * block_align, block_align, 16, b'data', 0,
+        )
+
+    def _read_loop(self):
+        """读取线程：唯一写入缓冲区的生产者，stop() 等待其退出后再读取"""
+        try:
+            while self.is_recording:
+                data, _overflowed = self.stream.read(self.blocksize)
+                self._write_block(np.frombuffer(data, dtype=DTYPE).reshape(-1, self.channels))
+        except Exception as e:
+            print(f"\n❌ 录音读取失败: {e}")
+            self.is_recording = False
 
-    def callback(self, indata, frames, time, status):
-        """录音回调函数"""
-        if self.is_recording:
-            self.audio_data.append(indata.copy())
+    def _write_block(self, block: np.ndarray):
+        """按写指针写入一块音频"""
+        end = self._write_pos + len(block)
+        if end > len(self._buffer):
+            self._grow(end)
+        self._buffer[self._write_pos:end] = block
+        self._write_pos = end
+
+    def _grow(self, min_frames: int):
+        """缓冲区扩容（至少翻倍，摊还后每帧 O(1)）"""
+        new_buffer = np.empty((max(min_frames, 2 * len(self._buffer)), self.channels), dtype=DTYPE)
+        new_buffer[:self._write_pos] = self._buffer[:self._write_pos]
+        self._buffer = new_buffer
 
     def start(self):
         """开始录音"""
         if self.is_recording:
             return False
 
-        self.audio_data = []
+        self._write_pos = 0
         self.is_recording = True
 
         try:
-            self.stream = sd.InputStream(
+            self.stream = sd.RawInputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype=DTYPE,
-                callback=self.callback,
-                blocksize=1024
+                blocksize=self.blocksize,
+                latency='low',
             )
             self.stream.start()
+            self._reader = threading.Thread(
+                target=self._read_loop, name="voice-ime-recorder", daemon=True
+            )
+            self._reader.start()
             return True
         except Exception as e:
             print(f"❌ 启动录音失败: {e}")
             self.is_recording = False
+            if self.stream:
+                self.stream.close()
+                self.stream = None
             return False
 
     def stop(self):
-        """停止录音"""
-        if not self.is_recording:
+        """停止录音
+
+        Returns:
+            录音数据（缓冲区的切片，不复制；下次 start() 前有效），无数据时返回 None
+        """
+        # 读取线程出错时会提前清除 is_recording，以 stream 判断是否需要收尾
+        if self.stream is None:
             return None
 
         self.is_recording = False
 
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
+        # 等待读取线程取完最后一块，之后缓冲区不再被写入
+        if self._reader:
+            self._reader.join()
+            self._reader = None
+
+        self.stream.stop()
+        self.stream.close()
+        self.stream = None
 
-        if self.audio_data:
-            audio_array = np.concatenate(self.audio_data)
-            return audio_array
+        if self._write_pos:
+            return self._buffer[:self._write_pos]
         return None
 
     def save_to_wav(self, audio_array: np.ndarray, filepath: str):
-        """保存为 WAV 文件"""
-        import wave
-        with wave.open(filepath, 'wb') as wf:
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(2)  # 16位 = 2字节
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(audio_array.tobytes())
+        """保存为 WAV 文件（预生成的文件头 + 原始 PCM，不经过 wave 模块）"""
+        audio = np.ascontiguousarray(audio_array, dtype=DTYPE)
+        header = bytearray(self._wav_header)
+        struct.pack_into('<I', header, 4, 36 + audio.nbytes)
+        struct.pack_into('<I', header, 40, audio.nbytes)
+        with open(filepath, 'wb') as f:
+            f.write(header)
+            f.write(audio.data)
 
 
 # ==================== LLM 润色接口（预留）================
@@ -150,16 +334,25 @@ class VoiceIME:
                  explain: bool = False,
                  scenario: Optional[str] = None,
                  priority: str = 'balanced',
+                 paste_delay: float = 0.0,
+                 cache_client: bool = True,
+                 blocksize: int = BLOCK_SIZE,
+                 race_fallback: bool = False,
                  **kwargs):
         self.hotkey = hotkey
         self.auto_paste = auto_paste  # 自动粘贴
+        self.paste_delay = paste_delay  # 粘贴前等待（秒）
         self.auto_copy = auto_copy    # 自动复制
         self.smart_mode = smart_mode
         self.explain = explain
         self.scenario = scenario
         self.priority = priority
 
-        self.recorder = Recorder()
+        # 短指令场景录音时长有限，缓冲区按场景预分配，超出时仍会自动扩容
+        buffer_seconds = RECORD_BUFFER_SECONDS
+        if smart_mode and scenario == 'command':
+            buffer_seconds = COMMAND_BUFFER_SECONDS
+        self.recorder = Recorder(buffer_seconds=buffer_seconds, blocksize=blocksize)
         self.llm = LLMPolish()  # 预留 LLM 润色
 
         # 创建 ASR 客户端
@@ -205,11 +398,37 @@ class VoiceIME:
             self.client = ASRClientFactory.create_with_fallback(
                 primary_engine=asr_engine,
                 fallback_engine='moss',
+                use_cache=cache_client,
                 **kwargs
             )
             print(f"✅ 使用引擎: {self.client.name}")
             self.selection_result = None
 
+        # 并发回退：本地主引擎与 MOSS 同时识别，先成功者胜出（每次识别多一次 API 调用）
+        self._backup_client = None
+        self._race_executor = None
+        if race_fallback:
+            api_key = kwargs.get('api_key')
+            if isinstance(self.client, MossClient):
+                print("⚠️  主引擎已是 MOSS，忽略 --race-fallback")
+            elif not api_key:
+                print("⚠️  --race-fallback 需要 MOSS API Key，已忽略")
+            else:
+                self._backup_client = ASRClientFactory.create('moss', api_key=api_key)
+                # 常驻线程池，每次识别复用；上一轮落败的调用可能仍占着线程，
+                # 多留两个工作线程保证新一轮两路都能立即开始
+                self._race_executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix='asr-race'
+                )
+                print(f"🏁 并发回退已启用: {self.client.name} + {self._backup_client.name}")
+
+        # 后台预热本地 ASR 模型（与首次录音重叠，首次识别不再承担冷启动开销）
+        # 仅对支持内存直传的本地引擎预热，云端引擎预热会产生真实 API 调用
+        if hasattr(self.client, 'transcribe_array'):
+            threading.Thread(
+                target=self._warmup_asr, name='asr-warmup', daemon=True
+            ).start()
+
         self.state = 'idle'
         self.status_messages = {
             'idle': '🛋️  等待录音 (按 {hotkey} 开始)',
@@ -222,6 +441,10 @@ class VoiceIME:
         self.temp_dir = Path.home() / '.voice_ime' / 'temp'
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+        # 临时文件由后台线程删除，unlink 不占用识别后的关键路径（首次使用时启动）
+        self._cleanup_q = queue.SimpleQueue()
+        self._cleanup_thread = None
+
         # 尝试导入 pyautogui 用于自动粘贴
         self.pyautogui = None
         if self.auto_paste:
@@ -233,104 +456,208 @@ class VoiceIME:
                 print("⚠️  pyautogui 未安装，自动粘贴功能不可用")
                 print("   安装: pip install pyautogui")
 
+        # 预热归一化内核（numba 首次调用需要 JIT 编译）
+        normalize_int16(np.zeros(16, dtype=np.int16))
+
+        # 提示音：预先合成开始/停止两个音调，并保持一个常开的输出流
+        self._tones = {
+            (freq, BEEP_DURATION): self._make_tone(freq, BEEP_DURATION)
+            for freq in (880, 660)
+        }
+        self._beep_stream = None
+        try:
+            stream = sd.OutputStream(samplerate=BEEP_SAMPLE_RATE, channels=1,
+                                     dtype='int16', latency='low')
+            stream.start()
+            self._beep_stream = stream
+        except Exception as e:
+            print(f"⚠️  提示音输出不可用: {e}")
+
     def print_status(self):
         """打印当前状态"""
         msg = self.status_messages.get(self.state, '').format(hotkey=self.hotkey)
         print(f"\r{msg}", end='', flush=True)
 
-    def beep(self, frequency: int = 880, duration: float = 0.1):
-        """播放提示音"""
+    def _cleanup_loop(self):
+        """后台线程：删除已用完的临时文件，收到 None 时退出"""
+        while True:
+            path = self._cleanup_q.get()
+            if path is None:
+                return
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _schedule_cleanup(self, path: Path):
+        """将临时文件交给后台线程删除"""
+        if self._cleanup_thread is None:
+            self._cleanup_thread = threading.Thread(
+                target=self._cleanup_loop, name='temp-cleanup', daemon=True
+            )
+            self._cleanup_thread.start()
+        self._cleanup_q.put(path)
+
+    def _finish_cleanup(self):
+        """等待排队中的临时文件全部删除"""
+        if self._cleanup_thread is not None:
+            self._cleanup_q.put(None)
+            self._cleanup_thread.join()
+            self._cleanup_thread = None
+
+    def _warmup_asr(self):
+        """用 0.1 秒静音跑一次推理，触发权重加载和首次推理的初始化"""
         try:
-            import pyaudio
-            p = pyaudio.PyAudio()
-            stream = p.open(format=pyaudio.paInt16, channels=1, rate=44100,
-                          output=True)
-            samples = (np.sin(2 * np.pi * np.arange(44100 * duration)
-                            * frequency / 44100) * 32767).astype(np.int16)
-            stream.write(samples.tobytes())
-            stream.close()
-            p.terminate()
-        except:
+            silence = np.zeros(SAMPLE_RATE // 10, dtype=np.int16)
+            with self.client.lock:
+                self.client.transcribe_array(silence, SAMPLE_RATE)
+        except Exception:
             pass
 
+    @staticmethod
+    def _make_tone(frequency: int, duration: float) -> np.ndarray:
+        """合成 int16 正弦提示音，形状 (frames, 1)"""
+        t = np.arange(int(BEEP_SAMPLE_RATE * duration))
+        samples = np.sin(2 * np.pi * frequency / BEEP_SAMPLE_RATE * t) * 32767
+        return samples.astype(np.int16).reshape(-1, 1)
+
+    def beep(self, frequency: int = 880, duration: float = BEEP_DURATION):
+        """播放提示音（复用预先合成的音调和常开的输出流）"""
+        if self._beep_stream is None:
+            return
+        tone = self._tones.get((frequency, duration))
+        if tone is None:
+            tone = self._tones[(frequency, duration)] = self._make_tone(frequency, duration)
+        try:
+            self._beep_stream.write(tone)
+        except Exception:
+            log.debug("beep failed", exc_info=True)
+
+    def _close_beep_stream(self):
+        """停止并关闭提示音输出流"""
+        stream, self._beep_stream = self._beep_stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception:
+            log.debug("closing beep stream failed", exc_info=True)
+
     def process_audio(self, audio_array: np.ndarray):
         """处理录音并识别"""
         self.state = 'processing'
         self.print_status()
 
-        # 生成文件名
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        audio_path = self.temp_dir / f'recording_{timestamp}.wav'
-
-        # 保存音频
-        print(f"\n💾 正在保存音频...")
-        self.recorder.save_to_wav(audio_array, str(audio_path))
+        normalize_int16(audio_array)
 
         # 调用 ASR 引擎
         try:
             start_time = time.time()
-            text = self.client.transcribe(str(audio_path))
+            if self._backup_client is not None:
+                text, engine_name = self._transcribe_race(audio_array)
+            else:
+                text, engine_name = self._transcribe_primary(audio_array), self.client.name
             elapsed = time.time() - start_time
 
-            # 清理文本（去除多余空白和字间空格）
-            text = text.strip()
-            # FunASR paraformer 模型会输出"字+空格"格式，去除字间空格
-            text = text.replace(' ', '')
-            # SenseVoice 模型会输出特殊标记，清理它们
-            import re
-            text = re.sub(r'<\|[^|]+\|>', '', text)
+            # 清理文本：去除 SenseVoice 特殊标记、
+            # FunASR paraformer 输出的字间空格以及首尾空白
+            text = _clean_text(text)
 
             # TODO: 可以在这里调用 LLM 润色
             # text = self.llm.polish(text, style="concise")
 
-            # 简化输出：只打印纯文本
-            print("\n" + "="*60)
-            print("📝 识别结果")
-            print("="*60)
-            print(f"\n{text}\n")
-            print("-"*60)
+            # 输出攒到一起，复制/粘贴完成后一次写出（只打印纯文本）
+            lines = ["", _SEP, "📝 识别结果", _SEP, "", text, "", _DASH]
 
             # 复制到剪贴板
             if self.auto_copy:
                 pyperclip.copy(text)
-                print("✅ 已复制到剪贴板")
+                lines.append("✅ 已复制到剪贴板")
 
             # 自动粘贴
-            if self.auto_paste and self.pyautogui:
-                time.sleep(0.3)  # 等待用户切换窗口
-                self.pyautogui.hotkey('ctrl', 'v')
-                print("✅ 已自动粘贴")
-
-            print(f"⏱️  耗时: {elapsed:.2f}秒 | 🏭 引擎: {self.client.name}")
-            print("="*60)
+            if self.auto_paste:
+                if self.paste_delay > 0:
+                    time.sleep(self.paste_delay)  # 等待用户切换窗口
+                if _native_paste():
+                    lines.append("✅ 已自动粘贴")
+                elif self.pyautogui:
+                    self.pyautogui.hotkey('ctrl', 'v')
+                    lines.append("✅ 已自动粘贴")
+
+            lines.append(f"⏱️  耗时: {elapsed:.2f}秒 | 🏭 引擎: {engine_name}")
+            lines.append(_SEP)
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
 
         except Exception as e:
             print(f"\n❌ 识别失败: {e}")
-            import traceback
-            traceback.print_exc()
+            # 完整堆栈只在 --verbose 时格式化输出
+            log.debug("transcribe failed", exc_info=True)
             self.state = 'error'
+
+    def _transcribe_primary(self, audio_array: np.ndarray) -> str:
+        """用主引擎识别：支持内存直传时不落盘，否则经临时 WAV 文件
+
+        客户端可能与预热线程或其他 VoiceIME 实例共享，推理期间持有 `client.lock`。
+        """
+        if hasattr(self.client, 'transcribe_array'):
+            # 内存直传，省去 WAV 写盘和回读
+            with self.client.lock:
+                return self.client.transcribe_array(audio_array, SAMPLE_RATE)
+
+        # 生成文件名（单调时钟纳秒值，免去 strftime 的时区/区域设置查询）
+        audio_path = self.temp_dir / f'rec_{time.monotonic_ns()}.wav'
+        try:
+            # 保存音频
+            print(f"\n💾 正在保存音频...")
+            self.recorder.save_to_wav(audio_array, str(audio_path))
+            with self.client.lock:
+                return self.client.transcribe(str(audio_path))
         finally:
             # 清理临时文件
-            try:
-                audio_path.unlink()
-            except:
-                pass
+            self._schedule_cleanup(audio_path)
+
+    def _transcribe_race(self, audio_array: np.ndarray):
+        """主引擎与备用 MOSS 并发识别，取先成功的结果
+
+        Returns:
+            (识别文本, 胜出引擎名称)；两者都失败时抛出最后一个异常
+        """
+        # 本地推理由 client.lock 串行化，不必等上一轮落败的调用结束
+
+        # 落败方可能仍在读取音频，不能直接引用会被下次录音覆盖的缓冲区
+        audio = audio_array.copy()
+        primary = self._race_executor.submit(self._transcribe_primary, audio)
+        backup = self._race_executor.submit(self._backup_client.transcribe_audio_data, audio)
+        engines = {primary: self.client.name, backup: self._backup_client.name}
+
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    # 已开始的调用无法中断，只能丢弃结果
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result(), engines[future]
+        raise error
 
     def on_hotkey(self):
         """快捷键处理函数"""
         if self.state == 'idle':
-            print("\n" + "="*60)
-            print("🎙️  语音输入")
-            print("="*60)
+            sys.stdout.write(f"\n{_SEP}\n🎙️  语音输入\n{_SEP}\n")
 
             if self.recorder.start():
                 self.state = 'recording'
-                self.beep(frequency=880, duration=0.15)
+                self.beep(frequency=880)
             else:
                 print("❌ 无法启动录音")
 
         elif self.state == 'recording':
-            self.beep(frequency=660, duration=0.15)
+            self.beep(frequency=660)
             print("\n⏹️  停止录音，开始识别...")
 
             audio_array = self.recorder.stop()
@@ -344,9 +671,9 @@ class VoiceIME:
 
     def run(self):
         """运行语音输入法"""
-        print("\n" + "="*60)
+        print("\n" + _SEP)
         print("🎤 VoiceIME 语音输入工具")
-        print("="*60)
+        print(_SEP)
 
         # 智能模式提示
         if self.smart_mode:
@@ -364,15 +691,32 @@ class VoiceIME:
 
         self.print_status()
 
-        # 注册热键
-        keyboard.add_hotkey(self.hotkey, self.on_hotkey)
-        keyboard.add_hotkey('esc', lambda: sys.exit(0))
+        # 注册热键：钩子回调只负责入队，录音/识别在主线程执行，
+        # 避免长时间识别阻塞键盘钩子线程导致丢键
+        events = queue.SimpleQueue()
+        keyboard.add_hotkey(self.hotkey, events.put, args=('hotkey',))
+        keyboard.add_hotkey('esc', events.put, args=('exit',))
 
         try:
-            keyboard.wait()
+            while True:
+                try:
+                    # 带超时等待，保证 Ctrl+C 能及时打断
+                    event = events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if event == 'exit':
+                    break
+                self.on_hotkey()
         except KeyboardInterrupt:
-            print("\n👋 退出程序")
-            sys.exit(0)
+            pass
+        finally:
+            keyboard.unhook_all_hotkeys()
+            self._close_beep_stream()
+            if self._race_executor is not None:
+                # 不在这里等待上一轮落败的调用
+                self._race_executor.shutdown(wait=False)
+            self._finish_cleanup()
+        print("\n👋 退出程序")
 
 
 def main():
@@ -449,6 +793,33 @@ def main():
         action='store_true',
         help='禁用自动复制到剪贴板功能'
     )
+    parser.add_argument(
+        '--paste-delay',
+        type=float,
+        default=0.0,
+        help='自动粘贴前等待的秒数 (默认: 0，立即粘贴)'
+    )
+    parser.add_argument(
+        '--blocksize',
+        type=int,
+        default=BLOCK_SIZE,
+        help=f'录音每次读取的帧数 (默认: {BLOCK_SIZE}，即 16ms；越小停止越灵敏，CPU 唤醒越频繁)'
+    )
+    parser.add_argument(
+        '--race-fallback',
+        action='store_true',
+        help='本地引擎与 MOSS 同时识别，取先返回的结果（需要 MOSS API Key，每次识别多一次 API 调用）'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不复用已加载的 ASR 客户端，每次重新创建（CI 等场景）'
+    )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='输出调试日志（含识别失败的完整堆栈）'
+    )
 
     # 智能选择参数
     parser.add_argument(
@@ -476,6 +847,8 @@ def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
     # 确定引擎
     asr_engine = args.asr
 
@@ -556,6 +929,10 @@ def main():
         explain=args.explain,
         scenario=args.scenario,
         priority=args.priority,
+        paste_delay=args.paste_delay,
+        cache_client=not args.no_cache,
+        blocksize=args.blocksize,
+        race_fallback=args.race_fallback,
         **engine_kwargs
     )
     app.run()